@@ -1,4 +1,10 @@
 import sys
+import binascii
+
+try:
+    from sys import intern as _intern
+except ImportError:
+    _intern = intern
 
 
 class fopen(object):
@@ -22,3 +28,37 @@ class fopen(object):
 
     def __exit__(self ,exc_type, exc_value, traceback):
         self._fp.close()
+
+
+if sys.version_info[0] < 3:
+    def int_from_bytes(data, byteorder):
+        data = bytearray(data)
+
+        if byteorder == 'little':
+            data.reverse()
+
+        return int(binascii.hexlify(data) or b'0', 16)
+
+    def int_to_bytes(value, length, byteorder):
+        data = bytearray(binascii.unhexlify('{:0{}x}'.format(value,
+                                                               2 * length)))
+
+        if byteorder == 'little':
+            data.reverse()
+
+        return bytes(data)
+else:
+    int_from_bytes = int.from_bytes
+    int_to_bytes = int.to_bytes
+
+
+def intern_string(value):
+    """Returns given string interned, or as is if it can not be
+    interned (for example ``None``).
+
+    """
+
+    try:
+        return _intern(value)
+    except TypeError:
+        return value
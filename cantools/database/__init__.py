@@ -1,10 +1,14 @@
 import os
+import multiprocessing
 from xml.etree import ElementTree
 from .errors import ParseError
 from .errors import Error
 from ..compat import fopen
 from . import can
 from . import diagnostics
+from . import snapshot
+from .can.bus import Bus
+from .watch import WatchedDatabase
 import textparser
 import diskcache
 
@@ -45,6 +49,55 @@ class UnsupportedDatabaseFormatError(Error):
         self.e_sym = e_sym
         self.e_cdd = e_cdd
 
+    def __reduce__(self):
+        return (type(self), (self.e_dbc, self.e_kcd, self.e_sym, self.e_cdd))
+
+
+# CAN database format modules, and exceptions they raise if given
+# input is not in their format.
+_CAN_DATABASE_FORMATS = {
+    'dbc': can.formats.dbc,
+    'kcd': can.formats.kcd,
+    'sym': can.formats.sym
+}
+
+_CAN_DATABASE_FORMAT_ERRORS = {
+    'dbc': textparser.ParseError,
+    'kcd': (ElementTree.ParseError, ValueError),
+    'sym': ParseError
+}
+
+
+def _create_unsupported_database_format_error(errors):
+    return UnsupportedDatabaseFormatError(errors.get('dbc'),
+                                          errors.get('kcd'),
+                                          errors.get('sym'),
+                                          errors.get('cdd'))
+
+
+def _parse_can_string(string, database_format):
+    """Parse given CAN database string and return its definitions, which
+    may be pickled and are loaded by :func:`_load_can_definitions()`.
+
+    """
+
+    return _CAN_DATABASE_FORMATS[database_format].parse_string(string)
+
+
+def _load_can_definitions(definitions, database_format, strict, lazy):
+    """Load given CAN database definitions returned by
+    :func:`_parse_can_string()` and return an internal database. Only
+    DBC messages are loaded lazily.
+
+    """
+
+    if database_format == 'dbc':
+        return can.formats.dbc.load_definitions(definitions, strict, lazy)
+    else:
+        return _CAN_DATABASE_FORMATS[database_format].load_definitions(
+            definitions,
+            strict)
+
 
 def _resolve_database_format_and_encoding(database_format,
                                           encoding,
@@ -92,7 +145,8 @@ def load_file(filename,
               encoding=None,
               frame_id_mask=None,
               strict=True,
-              cache_dir=None):
+              cache_dir=None,
+              lazy=False):
     """Open, read and parse given database file and return a
     :class:`can.Database<.can.Database>` or
     :class:`diagnostics.Database<.diagnostics.Database>` object with
@@ -141,7 +195,8 @@ def load_file(filename,
     file. Using a cache will significantly reduce the load time when
     reloading the same file. The cache directory is automatically
     created if it does not exist. Remove the cache directory
-    `cache_dir` to clear the cache.
+    `cache_dir` to clear the cache. Databases loaded from the cache
+    are never lazy.
 
     See :func:`~cantools.database.load_string()` for descriptions of
     other arguments.
@@ -167,7 +222,8 @@ def load_file(filename,
             return load(fin,
                         database_format,
                         frame_id_mask,
-                        strict)
+                        strict,
+                        lazy)
     else:
         return _load_file_cache(filename,
                                 database_format,
@@ -177,6 +233,176 @@ def load_file(filename,
                                 cache_dir)
 
 
+def _parse_can_file(filename, database_format, encoding):
+    """Open, read and parse given CAN database file and return its
+    database format and parsed definitions. Runs in worker processes
+    of :func:`~cantools.database.load_files()`, so exceptions and
+    definitions are pickled and passed to the caller.
+
+    """
+
+    database_format, encoding = _resolve_database_format_and_encoding(
+        database_format,
+        encoding,
+        filename)
+
+    if database_format not in _CAN_DATABASE_FORMATS:
+        raise ValueError(
+            "expected database format 'dbc', 'kcd' or 'sym', but got "
+            "'{}'".format(database_format))
+
+    with fopen(filename, 'r', encoding=encoding) as fin:
+        string = fin.read()
+
+    try:
+        return database_format, _parse_can_string(string, database_format)
+    except _CAN_DATABASE_FORMAT_ERRORS[database_format] as e:
+        raise _create_unsupported_database_format_error({database_format: e})
+
+
+def _parse_can_file_in_worker(args):
+    return _parse_can_file(*args)
+
+
+def _load_can_file_definitions(database_format, definitions, strict, lazy):
+    """Load given definitions returned by :func:`_parse_can_file()` and
+    return an internal database.
+
+    """
+
+    try:
+        return _load_can_definitions(definitions,
+                                     database_format,
+                                     strict,
+                                     lazy)
+    except _CAN_DATABASE_FORMAT_ERRORS[database_format] as e:
+        raise _create_unsupported_database_format_error({database_format: e})
+
+
+def load_files(filenames,
+               database_format=None,
+               encoding=None,
+               frame_id_mask=None,
+               strict=True,
+               workers=None):
+    """Open, read and parse given CAN database files in parallel and
+    return a :class:`can.Database<.can.Database>` object with their
+    contents.
+
+    The files are parsed by `workers` processes, by default one per
+    CPU. If `workers` is ``1`` the files are parsed in the calling
+    process.
+
+    The database contains the messages, nodes and buses of all files,
+    and the version and DBC specifics of the last file. Nodes with the
+    same name in more than one file are only added once. Messages not
+    on a bus are tagged with a bus named as their file without
+    extension.
+
+    Exceptions raised when parsing a file in a worker process are
+    raised by this function.
+
+    See :func:`~cantools.database.load_file()` for descriptions of
+    other arguments. Only DBC, KCD and SYM files are supported.
+
+    >>> db = cantools.database.load_files(['powertrain.dbc', 'body.dbc'])
+    >>> db.get_message_by_name('Foo').bus_name
+    'body'
+
+    """
+
+    args = [
+        (filename, database_format, encoding)
+        for filename in filenames
+    ]
+
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+
+    workers = min(workers, len(args))
+
+    # Files are only parsed by the workers, as loaded messages and
+    # their codecs are slower to pickle than to load from the parsed
+    # definitions. Exceptions raised by the workers are re-raised.
+    if workers > 1:
+        pool = multiprocessing.Pool(workers)
+
+        try:
+            parsed_files = pool.map(_parse_can_file_in_worker, args)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        parsed_files = map(_parse_can_file_in_worker, args)
+
+    messages = []
+    nodes = []
+    buses = []
+    version = None
+    dbc_specifics = None
+
+    for filename, parsed_file in zip(filenames, parsed_files):
+        database = _load_can_file_definitions(*parsed_file,
+                                              strict=strict,
+                                              lazy=False)
+
+        bus_name = os.path.splitext(os.path.basename(filename))[0]
+        is_bus_used = False
+
+        for message in database.messages:
+            if message.bus_name is None:
+                message.bus_name = bus_name
+                is_bus_used = True
+
+        messages += database.messages
+
+        # Nodes in more than one file are only added once.
+        node_names = set([node.name for node in nodes])
+        nodes += [
+            node
+            for node in database.nodes or []
+            if node.name not in node_names
+        ]
+        buses += database.buses
+
+        if is_bus_used and bus_name not in [bus.name for bus in buses]:
+            buses.append(Bus(bus_name))
+
+        version = database.version
+        dbc_specifics = database.dbc
+
+    return can.Database(messages,
+                        nodes,
+                        buses,
+                        version,
+                        dbc_specifics,
+                        frame_id_mask=frame_id_mask,
+                        strict=strict)
+
+
+def load_snapshot(filename, database_filename=None):
+    """Load a database from given snapshot file `filename`, saved by
+    :meth:`can.Database.save_snapshot()<.can.Database.save_snapshot()>`.
+
+    If `database_filename` is given, an exception is raised if the
+    snapshot is out of date with that database file. The file is
+    only hashed if its size is unchanged, but its modification time
+    differs from when the snapshot was saved.
+
+    Snapshots are pickled, so only load snapshots from trusted
+    sources.
+
+    >>> try:
+    ...     db = cantools.database.load_snapshot('foo.snapshot', 'foo.dbc')
+    ... except cantools.database.Error:
+    ...     db = cantools.database.load_file('foo.dbc')
+    ...     db.save_snapshot('foo.snapshot', 'foo.dbc')
+
+    """
+
+    return snapshot.load(filename, database_filename)
+
+
 def dump_file(database,
               filename,
               database_format=None,
@@ -211,7 +437,8 @@ def dump_file(database,
 def load(fp,
          database_format=None,
          frame_id_mask=None,
-         strict=True):
+         strict=True,
+         lazy=False):
     """Read and parse given database file-like object and return a
     :class:`can.Database<.can.Database>` or
     :class:`diagnostics.Database<.diagnostics.Database>` object with
@@ -225,6 +452,10 @@ def load(fp,
     exception if given file-like object does not contain a supported
     database format.
 
+    DBC files are read line by line if `database_format` is
+    ``'dbc'``. Signal definitions are scanned while reading, and all
+    other lines are kept in memory and parsed at the end of the file.
+
     >>> with open('foo.kcd') as fin:
     ...    db = cantools.database.load(fin)
     >>> db.version
@@ -232,16 +463,30 @@ def load(fp,
 
     """
 
+    if database_format == 'dbc':
+        db = can.Database(frame_id_mask=frame_id_mask,
+                          strict=strict,
+                          lazy=lazy)
+
+        try:
+            db.add_dbc(fp)
+        except textparser.ParseError as e:
+            raise UnsupportedDatabaseFormatError(e, None, None, None)
+
+        return db
+
     return load_string(fp.read(),
                        database_format,
                        frame_id_mask,
-                       strict)
+                       strict,
+                       lazy)
 
 
 def load_string(string,
                 database_format=None,
                 frame_id_mask=None,
-                strict=True):
+                strict=True,
+                lazy=False):
     """Parse given database string and return a
     :class:`can.Database<.can.Database>` or
     :class:`diagnostics.Database<.diagnostics.Database>` object with
@@ -251,7 +496,7 @@ def load_string(string,
     ``'cdd'`` or ``None``, where ``None`` means transparent format.
 
     See :class:`can.Database<.can.Database>` for a description of
-    `strict`.
+    `strict` and `lazy`. Only DBC files are loaded lazily.
 
     Raises an
     :class:`~cantools.database.UnsupportedDatabaseFormatError`
@@ -270,41 +515,29 @@ def load_string(string,
             "expected database format 'dbc', 'kcd', 'sym', 'cdd' or None, but "
             "got '{}'".format(database_format))
 
-    e_dbc = None
-    e_kcd = None
-    e_sym = None
-    e_cdd = None
-
-    def load_can_database(fmt):
-        db = can.Database(frame_id_mask=frame_id_mask,
-                          strict=strict)
-
-        if fmt == 'dbc':
-            db.add_dbc_string(string)
-        elif fmt == 'kcd':
-            db.add_kcd_string(string)
-        elif fmt == 'sym':
-            db.add_sym_string(string)
+    errors = {}
 
-        return db
-
-    if database_format in ['dbc', None]:
-        try:
-            return load_can_database('dbc')
-        except textparser.ParseError as e:
-            e_dbc = e
-
-    if database_format in ['kcd', None]:
-        try:
-            return load_can_database('kcd')
-        except (ElementTree.ParseError, ValueError) as e:
-            e_kcd = e
+    for fmt in ['dbc', 'kcd', 'sym']:
+        if database_format not in [fmt, None]:
+            continue
 
-    if database_format in ['sym', None]:
         try:
-            return load_can_database('sym')
-        except ParseError as e:
-            e_sym = e
+            database = _load_can_definitions(_parse_can_string(string, fmt),
+                                             fmt,
+                                             strict,
+                                             lazy)
+        except _CAN_DATABASE_FORMAT_ERRORS[fmt] as e:
+            errors[fmt] = e
+            continue
+
+        return can.Database(database.messages,
+                            database.nodes,
+                            database.buses,
+                            database.version,
+                            database.dbc,
+                            frame_id_mask=frame_id_mask,
+                            strict=strict,
+                            lazy=lazy)
 
     if database_format in ['cdd', None]:
         try:
@@ -312,6 +545,6 @@ def load_string(string,
             db.add_cdd_string(string)
             return db
         except (ElementTree.ParseError, ValueError) as e:
-            e_cdd = e
+            errors['cdd'] = e
 
-    raise UnsupportedDatabaseFormatError(e_dbc, e_kcd, e_sym, e_cdd)
+    raise _create_unsupported_database_format_error(errors)
@@ -1,27 +1,45 @@
 import logging
+from collections import defaultdict
+from numbers import Integral
 
 from .formats import dbc
 from .formats import kcd
 from .formats import sym
 from .internal_database import InternalDatabase
+from .internal_database import LazyMessage
+from .. import snapshot
+from ..utils import CacheInfo
+from ..errors import DECODE_ERROR_UNKNOWN_MESSAGE
 from ...compat import fopen
+from ...j1939 import pgn_from_frame_id
 
 
 LOGGER = logging.getLogger(__name__)
 
+# Maximum number of frame ids in the frame id to message cache.
+FRAME_ID_CACHE_MAXSIZE = 1024
+
 
 class Database(object):
     """This class contains all messages, signals and definitions of a CAN
     network.
 
     The factory functions :func:`load()<cantools.database.load()>`,
-    :func:`load_file()<cantools.database.load_file()>` and
+    :func:`load_file()<cantools.database.load_file()>`,
+    :func:`load_files()<cantools.database.load_files()>` and
     :func:`load_string()<cantools.database.load_string()>` returns
     instances of this class.
 
     If `strict` is ``True`` an exception is raised if any signals are
     overlapping or if they don't fit in their message.
 
+    If `lazy` is ``True`` messages in added DBC files are only indexed
+    by name and frame id when added. Their signals and codecs are
+    loaded when first used, which is when they are found by name or
+    frame id, or when :attr:`.messages` is accessed. Errors in a
+    message, for example overlapping signals, are raised when it is
+    loaded.
+
     """
 
     def __init__(self,
@@ -31,12 +49,19 @@ class Database(object):
                  version=None,
                  dbc_specifics=None,
                  frame_id_mask=None,
-                 strict=True):
+                 strict=True,
+                 lazy=False):
         self._messages = messages if messages else []
         self._nodes = nodes if nodes else []
         self._buses = buses if buses else []
         self._name_to_message = {}
         self._frame_id_to_message = {}
+        self._pgn_to_message = {}
+        self._frame_id_cache = {}
+        self._frame_id_cache_hits = 0
+        self._frame_id_cache_misses = 0
+        self._name_to_node = {}
+        self._name_to_bus = {}
         self._version = version
         self._dbc = dbc_specifics
 
@@ -45,6 +70,7 @@ class Database(object):
 
         self._frame_id_mask = frame_id_mask
         self._strict = strict
+        self._lazy = lazy
         self.refresh()
 
     @property
@@ -57,6 +83,10 @@ class Database(object):
 
         """
 
+        for index, message in enumerate(self._messages):
+            if isinstance(message, LazyMessage):
+                self._load_message(message, index)
+
         return self._messages
 
     @property
@@ -95,13 +125,19 @@ class Database(object):
         """Read and parse DBC data from given file-like object and add the
         parsed data to the database.
 
+        The file-like object is read line by line. Signal definitions
+        are scanned while reading, and all other lines are kept in
+        memory and parsed at the end of the file.
+
         >>> db = cantools.database.Database()
         >>> with open ('foo.dbc', 'r') as fin:
         ...     db.add_dbc(fin)
 
         """
 
-        self.add_dbc_string(fp.read())
+        database = dbc.load(fp, self._strict, self._lazy)
+
+        self._add_database(database)
 
     def add_dbc_file(self, filename, encoding='cp1252'):
         """Open, read and parse DBC data from given file and add the parsed
@@ -127,14 +163,9 @@ class Database(object):
 
         """
 
-        database = dbc.load_string(string, self._strict)
+        database = dbc.load_string(string, self._strict, self._lazy)
 
-        self._messages += database.messages
-        self._nodes = database.nodes
-        self._buses = database.buses
-        self._version = database.version
-        self._dbc = database.dbc
-        self.refresh()
+        self._add_database(database)
 
     def add_kcd(self, fp):
         """Read and parse KCD data from given file-like object and add the
@@ -163,12 +194,7 @@ class Database(object):
 
         database = kcd.load_string(string, self._strict)
 
-        self._messages += database.messages
-        self._nodes = database.nodes
-        self._buses = database.buses
-        self._version = database.version
-        self._dbc = database.dbc
-        self.refresh()
+        self._add_database(database)
 
     def add_sym(self, fp):
         """Read and parse SYM data from given file-like object and add the
@@ -197,12 +223,53 @@ class Database(object):
 
         database = sym.load_string(string, self._strict)
 
+        self._add_database(database)
+
+    def _add_database(self, database):
+        """Add messages in given internal database, and replace the other
+        contents. Only added messages are refreshed and indexed.
+
+        """
+
+        start = len(self._messages)
         self._messages += database.messages
         self._nodes = database.nodes
         self._buses = database.buses
         self._version = database.version
         self._dbc = database.dbc
-        self.refresh()
+        self._frame_id_cache = {}
+        self._refresh_nodes_and_buses()
+
+        for index, message in enumerate(database.messages, start):
+            self._refresh_message(message, index)
+            self._add_message(message)
+
+    def _refresh_message(self, message, index):
+        """Refresh given message at given index if modified since last
+        refreshed. Lazy messages are not refreshed, but their index is
+        stored to replace them in constant time when loaded.
+
+        """
+
+        if isinstance(message, LazyMessage):
+            message.index = index
+
+            return
+
+        if message._is_modified(self._strict):
+            message.refresh(self._strict)
+        else:
+            message._reset_choice_numbers()
+
+    def _refresh_nodes_and_buses(self):
+        self._name_to_node = {}
+        self._name_to_bus = {}
+
+        for node in self._nodes or []:
+            self._name_to_node.setdefault(node.name, node)
+
+        for bus in self._buses or []:
+            self._name_to_bus.setdefault(bus.name, bus)
 
     def _add_message(self, message):
         """Add given message to the database.
@@ -228,12 +295,27 @@ class Database(object):
         self._name_to_message[message.name] = message
         self._frame_id_to_message[masked_frame_id] = message
 
+        if self._is_pgn_message(message):
+            pgn = pgn_from_frame_id(message.frame_id)
+            self._pgn_to_message.setdefault(pgn, message)
+
+    @staticmethod
+    def _is_pgn_message(message):
+        """Returns ``True`` if given message is found by its parameter group
+        number.
+
+        """
+
+        return (message.protocol == 'j1939'
+                and message.is_extended_frame
+                and message.frame_id <= 0x1fffffff)
+
     def as_dbc_string(self):
         """Return the database as a string formatted as a DBC file.
 
         """
 
-        return dbc.dump_string(InternalDatabase(self._messages,
+        return dbc.dump_string(InternalDatabase(self.messages,
                                                 self._nodes,
                                                 self._buses,
                                                 self._version,
@@ -244,47 +326,188 @@ class Database(object):
 
         """
 
-        return kcd.dump_string(InternalDatabase(self._messages,
+        return kcd.dump_string(InternalDatabase(self.messages,
                                                 self._nodes,
                                                 self._buses,
                                                 self._version,
                                                 self._dbc))
 
+    def save_snapshot(self, filename, database_filename=None):
+        """Save the database as a binary snapshot in given file
+        `filename`, including compiled codecs. Load it with
+        :func:`~cantools.database.load_snapshot()`, which is much faster
+        than parsing the database file.
+
+        If `database_filename` is given the snapshot is tied to the
+        modification time, size and hash of that file, so out of date
+        snapshots are detected when loaded.
+
+        >>> db = cantools.database.load_file('foo.dbc')
+        >>> db.save_snapshot('foo.snapshot', 'foo.dbc')
+
+        """
+
+        # Lazy messages can not be saved.
+        self.messages
+
+        snapshot.save(self, filename, database_filename)
+
+    def _load_message(self, lazy_message, index=None):
+        """Load given lazy message and replace it with the loaded message in
+        the database.
+
+        """
+
+        message = lazy_message.load()
+
+        if index is None:
+            index = lazy_message.index
+
+        self._messages[index] = message
+
+        if self._name_to_message.get(message.name) is lazy_message:
+            self._name_to_message[message.name] = message
+
+        masked_frame_id = (message.frame_id & self._frame_id_mask)
+
+        if self._frame_id_to_message.get(masked_frame_id) is lazy_message:
+            self._frame_id_to_message[masked_frame_id] = message
+
+        if self._is_pgn_message(message):
+            pgn = pgn_from_frame_id(message.frame_id)
+
+            if self._pgn_to_message.get(pgn) is lazy_message:
+                self._pgn_to_message[pgn] = message
+
+        return message
+
+    def _find_message(self, frame_id_or_name):
+        """Find a message by frame id, as
+        :meth:`.try_get_message_by_frame_id()`, or by name.
+
+        """
+
+        if isinstance(frame_id_or_name, Integral):
+            return self.try_get_message_by_frame_id(frame_id_or_name)
+
+        message = self._name_to_message.get(frame_id_or_name)
+
+        if isinstance(message, LazyMessage):
+            message = self._load_message(message)
+
+        return message
+
+    def _get_message(self, frame_id_or_name):
+        message = self._find_message(frame_id_or_name)
+
+        if message is None:
+            raise KeyError(frame_id_or_name)
+
+        return message
+
     def get_message_by_name(self, name):
         """Find the message object for given name `name`.
 
         """
 
-        return self._name_to_message[name]
+        message = self._name_to_message[name]
+
+        if isinstance(message, LazyMessage):
+            message = self._load_message(message)
+
+        return message
+
+    def _find_message_by_frame_id(self, frame_id):
+        try:
+            return self._frame_id_to_message[frame_id & self._frame_id_mask]
+        except KeyError:
+            pass
+
+        # J1939 messages are also found by their parameter group
+        # number, as priority and source address often varies. Only
+        # extended frames are J1939 frames.
+        if self._pgn_to_message and 0x7ff < frame_id <= 0x1fffffff:
+            return self._pgn_to_message.get(pgn_from_frame_id(frame_id))
+
+        return None
 
     def get_message_by_frame_id(self, frame_id):
         """Find the message object for given frame id `frame_id`.
 
+        Extended frame messages using the J1939 protocol are also
+        found by their parameter group number (PGN) if no message has
+        given frame id, so the priority and source address may differ
+        from the message frame id. Only frame ids above 0x7ff are
+        looked up by PGN, as other ids are standard frame ids.
+
+        Lookups are cached per frame id, see
+        :meth:`.frame_id_cache_info()`.
+
+        """
+
+        message = self.try_get_message_by_frame_id(frame_id)
+
+        if message is None:
+            raise KeyError(frame_id)
+
+        return message
+
+    def try_get_message_by_frame_id(self, frame_id):
+        """Same as :meth:`.get_message_by_frame_id()`, but returns ``None``
+        instead of raising an exception if no message has given frame
+        id `frame_id`.
+
+        """
+
+        try:
+            message = self._frame_id_cache[frame_id]
+            self._frame_id_cache_hits += 1
+        except KeyError:
+            message = self._find_message_by_frame_id(frame_id)
+            self._frame_id_cache_misses += 1
+
+            if isinstance(message, LazyMessage):
+                message = self._load_message(message)
+
+            if len(self._frame_id_cache) >= FRAME_ID_CACHE_MAXSIZE:
+                self._frame_id_cache.clear()
+
+            self._frame_id_cache[frame_id] = message
+
+        return message
+
+    def frame_id_cache_info(self):
+        """Returns a named tuple of hits, misses, maximum size and current
+        size of the frame id to message cache used by
+        :meth:`.get_message_by_frame_id()`.
+
+        >>> db.get_message_by_frame_id(158)
+        message('Foo', 0x9e, False, 5, None)
+        >>> db.get_message_by_frame_id(158)
+        message('Foo', 0x9e, False, 5, None)
+        >>> db.frame_id_cache_info()
+        CacheInfo(hits=1, misses=1, maxsize=1024, currsize=1)
+
         """
 
-        return self._frame_id_to_message[frame_id & self._frame_id_mask]
+        return CacheInfo(self._frame_id_cache_hits,
+                         self._frame_id_cache_misses,
+                         FRAME_ID_CACHE_MAXSIZE,
+                         len(self._frame_id_cache))
 
     def get_node_by_name(self, name):
         """Find the node object for given name `name`.
 
         """
 
-        for node in self._nodes:
-            if node.name == name:
-                return node
-
-        raise KeyError(name)
+        return self._name_to_node[name]
 
     def get_bus_by_name(self, name):
         """Find the bus object for given name `name`.
 
         """
 
-        for bus in self._buses:
-            if bus.name == name:
-                return bus
-
-        raise KeyError(name)
+        return self._name_to_bus[name]
 
     def encode_message(self,
                        frame_id_or_name,
@@ -310,10 +533,7 @@ class Database(object):
 
         """
 
-        try:
-            message = self._frame_id_to_message[frame_id_or_name]
-        except KeyError:
-            message = self._name_to_message[frame_id_or_name]
+        message = self._get_message(frame_id_or_name)
 
         return message.encode(data, scaling, padding, strict)
 
@@ -321,7 +541,9 @@ class Database(object):
                        frame_id_or_name,
                        data,
                        decode_choices=True,
-                       scaling=True):
+                       scaling=True,
+                       offset=0,
+                       signals=None):
         """Decode given signal data `data` as a message of given frame id or
         name `frame_id_or_name`. Returns a dictionary of signal
         name-value entries.
@@ -331,6 +553,12 @@ class Database(object):
 
         If `scaling` is ``False`` no scaling of signals is performed.
 
+        If `offset` is non-zero the message is decoded from given
+        offset in `data`, without copying it.
+
+        If `signals` is a list of signal names only those signals are
+        decoded.
+
         >>> db.decode_message(158, b'\\x01\\x45\\x23\\x00\\x11')
         {'Bar': 1, 'Fum': 5.0}
         >>> db.decode_message('Foo', b'\\x01\\x45\\x23\\x00\\x11')
@@ -338,27 +566,107 @@ class Database(object):
 
         """
 
-        try:
-            message = self._frame_id_to_message[frame_id_or_name]
-        except KeyError:
-            message = self._name_to_message[frame_id_or_name]
+        message = self._get_message(frame_id_or_name)
+
+        return message.decode(data, decode_choices, scaling, offset, signals)
+
+    def try_decode_message(self,
+                           frame_id_or_name,
+                           data,
+                           decode_choices=True,
+                           scaling=True,
+                           offset=0):
+        """Same as :meth:`.decode_message()`, but returns a tuple of the
+        decoded signals and ``None``, or ``None`` and an error code if
+        the data can not be decoded, instead of raising an exception.
+
+        The error code is
+        :data:`~cantools.database.errors.DECODE_ERROR_UNKNOWN_MESSAGE`
+        if the database has no message with given frame id or name,
+        otherwise as returned by :meth:`Message.try_decode()
+        <.can.Message.try_decode()>`.
+
+        >>> db.try_decode_message(158, b'\\x01\\x45\\x23\\x00\\x11')
+        ({'Bar': 1, 'Fum': 5.0}, None)
+        >>> db.try_decode_message(1, b'') == (None, DECODE_ERROR_UNKNOWN_MESSAGE)
+        True
+
+        """
+
+        message = self._find_message(frame_id_or_name)
+
+        if message is None:
+            return None, DECODE_ERROR_UNKNOWN_MESSAGE
 
-        return message.decode(data, decode_choices, scaling)
+        return message.try_decode(data, decode_choices, scaling, offset)
+
+    def decode_many(self, frames, decode_choices=True, scaling=True):
+        """Decode given frames `frames`, an iterable of frame id and data
+        tuples. Returns a dictionary of message names and decoded
+        signals, where the decoded signals are dictionaries of signal
+        names and lists of values in frame order, as returned by
+        :meth:`Message.decode_many()<.can.Message.decode_many()>`.
+
+        Frames with frame ids not in the database are ignored.
+
+        See :meth:`.decode_message()` for descriptions of other
+        arguments.
+
+        >>> db.decode_many([(158, b'\\x01\\x45\\x23\\x00\\x11'),
+        ...                 (159, b'\\x00\\x00\\x00\\x00'),
+        ...                 (158, b'\\x00\\x45\\x23\\x00\\x13')])
+        {'Foo': {'Bar': [1, 0], 'Fum': [5.0, 5.25]}, 'Fie': {'Fas': [0]}}
+
+        """
+
+        datas_per_message = defaultdict(list)
+
+        for frame_id, data in frames:
+            try:
+                message = self.get_message_by_frame_id(frame_id)
+            except KeyError:
+                continue
+
+            datas_per_message[message].append(data)
+
+        decoded = {}
+
+        for message, datas in datas_per_message.items():
+            decoded[message.name] = message.decode_many(datas,
+                                                        decode_choices,
+                                                        scaling)
+
+        return decoded
 
     def refresh(self):
         """Refresh the internal database state.
 
-        This method must be called after modifying any message in the
-        database to refresh the internal lookup tables used when
-        encoding and decoding messages.
+        This method must be called after modifying any message, node
+        or bus in the database to refresh the internal lookup tables
+        used when encoding and decoding messages, and when finding
+        objects by name.
+
+        Only messages modified by message and signal property setters,
+        with added, removed or replaced signals, or with modified
+        multiplexer choices, since last refreshed are refreshed. The
+        reverse choice lookup tables of all signals are recreated, so
+        signal choices may be modified in place. Call
+        :meth:`Message.refresh()<.Message.refresh()>` after modifying
+        any other list or dictionary of a message or signal, for
+        example signal receivers.
 
         """
 
         self._name_to_message = {}
         self._frame_id_to_message = {}
-
-        for message in self._messages:
-            message.refresh(self._strict)
+        self._pgn_to_message = {}
+        self._frame_id_cache = {}
+        self._frame_id_cache_hits = 0
+        self._frame_id_cache_misses = 0
+        self._refresh_nodes_and_buses()
+
+        for index, message in enumerate(self._messages):
+            self._refresh_message(message, index)
             self._add_message(message)
 
     def __repr__(self):
@@ -373,7 +681,7 @@ class Database(object):
 
             lines.append('')
 
-        for message in self._messages:
+        for message in self.messages:
             lines.append(repr(message))
 
             for signal in message.signals:
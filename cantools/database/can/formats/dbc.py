@@ -4,6 +4,7 @@ import re
 from collections import OrderedDict as odict
 from collections import defaultdict
 from decimal import Decimal
+from functools import partial
 
 import textparser
 from textparser import Sequence
@@ -26,6 +27,7 @@ from ..signal import Decimal as SignalDecimal
 from ..message import Message
 from ..node import Node
 from ..internal_database import InternalDatabase
+from ..internal_database import LazyMessage
 
 from .utils import num
 
@@ -93,47 +95,49 @@ FLOAT_SIGNAL_TYPES = [
 ]
 
 
+# DBC keywords, which are not allowed as names.
+KEYWORDS = set([
+    'BA_',
+    'BA_DEF_',
+    'BA_DEF_DEF_',
+    'BA_DEF_DEF_REL_',
+    'BA_DEF_REL_',
+    'BA_DEF_SGTYPE_',
+    'BA_REL_',
+    'BA_SGTYPE_',
+    'BO_',
+    'BO_TX_BU_',
+    'BS_',
+    'BU_',
+    'BU_BO_REL_',
+    'BU_EV_REL_',
+    'BU_SG_REL_',
+    'CAT_',
+    'CAT_DEF_',
+    'CM_',
+    'ENVVAR_DATA_',
+    'EV_',
+    'EV_DATA_',
+    'FILTER',
+    'NS_',
+    'NS_DESC_',
+    'SG_',
+    'SG_MUL_VAL_',
+    'SGTYPE_',
+    'SGTYPE_VAL_',
+    'SIG_GROUP_',
+    'SIG_TYPE_REF_',
+    'SIG_VALTYPE_',
+    'SIGTYPE_VALTYPE_',
+    'VAL_',
+    'VAL_TABLE_',
+    'VERSION'
+])
+
+
 class Parser(textparser.Parser):
 
     def tokenize(self, string):
-        keywords = set([
-            'BA_',
-            'BA_DEF_',
-            'BA_DEF_DEF_',
-            'BA_DEF_DEF_REL_',
-            'BA_DEF_REL_',
-            'BA_DEF_SGTYPE_',
-            'BA_REL_',
-            'BA_SGTYPE_',
-            'BO_',
-            'BO_TX_BU_',
-            'BS_',
-            'BU_',
-            'BU_BO_REL_',
-            'BU_EV_REL_',
-            'BU_SG_REL_',
-            'CAT_',
-            'CAT_DEF_',
-            'CM_',
-            'ENVVAR_DATA_',
-            'EV_',
-            'EV_DATA_',
-            'FILTER',
-            'NS_',
-            'NS_DESC_',
-            'SG_',
-            'SG_MUL_VAL_',
-            'SGTYPE_',
-            'SGTYPE_VAL_',
-            'SIG_GROUP_',
-            'SIG_TYPE_REF_',
-            'SIG_VALTYPE_',
-            'SIGTYPE_VALTYPE_',
-            'VAL_',
-            'VAL_TABLE_',
-            'VERSION'
-        ])
-
         names = {
             'LPAREN': '(',
             'RPAREN': ')',
@@ -178,7 +182,7 @@ class Parser(textparser.Parser):
             elif kind != 'MISMATCH':
                 value = mo.group(kind)
 
-                if value in keywords:
+                if value in KEYWORDS:
                     kind = value
 
                 if kind in names:
@@ -310,8 +314,294 @@ class Parser(textparser.Parser):
                 version))
 
 
+# Message and signal definitions on single lines, as tokenized and
+# parsed by the parser.
+_WORD = r'[A-Za-z_][A-Za-z0-9_]*'
+_NUMBER = r'-?\d+\.?\d*(?:[eE][+-]?\d+)?'
+
+RE_MESSAGE = re.compile(
+    r'^BO_[ \t]+(\d+)[ \t]+({word})[ \t]*:[ \t]*(\d+)[ \t]+({word})'
+    r'[ \t\r]*$'.format(word=_WORD),
+    re.MULTILINE)
+
+_SIGNAL = (
+    r'SG_[ \t]+({word})(?:[ \t]+({word}))?[ \t]*:'
+    r'[ \t]*({number})[ \t]*\|[ \t]*({number})[ \t]*@[ \t]*({number})'
+    r'[ \t]*([+-])[ \t]*'
+    r'\([ \t]*({number})[ \t]*,[ \t]*({number})[ \t]*\)[ \t]*'
+    r'\[[ \t]*({number})[ \t]*\|[ \t]*({number})[ \t]*\][ \t]*'
+    r'"([^"\\\r\n]*)"[ \t]*'
+    r'({word}(?:[ \t]*,[ \t]*{word})*)[ \t\r]*$'.format(word=_WORD,
+                                                      number=_NUMBER))
+
+RE_SIGNAL = re.compile(r'[ \t\r\n]+' + _SIGNAL, re.MULTILINE)
+
+RE_SIGNAL_LINE = re.compile(r'[ \t]*' + _SIGNAL, re.MULTILINE)
+
+
+def _scan_signal(mo):
+    """Returns given signal definition match as the parser does.
+
+    """
+
+    name = mo.group(1)
+    multiplexer = mo.group(2)
+    receivers = [
+        receiver.strip()
+        for receiver in mo.group(12).split(',')
+    ]
+
+    if multiplexer is None:
+        names = [name]
+    else:
+        names = [name, multiplexer]
+
+    if not KEYWORDS.isdisjoint(names) or not KEYWORDS.isdisjoint(receivers):
+        return None
+
+    return ['SG_', names, ':',
+            mo.group(3), '|', mo.group(4), '@', mo.group(5), mo.group(6),
+            '(', mo.group(7), ',', mo.group(8), ')',
+            '[', mo.group(9), '|', mo.group(10), ']',
+            mo.group(11),
+            receivers]
+
+
+class ScannedMessage(str):
+    """The value of the ``BO_`` token of a message definition followed by
+    scanned signal definitions `signals`. Equal to ``'BO_'``.
+
+    """
+
+    def __new__(cls, signals):
+        value = str.__new__(cls, 'BO_')
+        value.signals = signals
+
+        return value
+
+
+class RemainingParser(Parser):
+    """Parses what remains of a DBC file when signal definitions following
+    message definitions have been scanned. `messages` is a dictionary
+    of offsets of the message definitions to their
+    :class:`ScannedMessage` values.
+
+    """
+
+    def __init__(self, messages):
+        self._messages = messages
+
+    def tokenize(self, string):
+        tokens = Parser.tokenize(self, string)
+        messages = self._messages
+
+        for i, token in enumerate(tokens):
+            if token.kind == 'BO_' and token.offset in messages:
+                tokens[i] = Token('BO_', messages[token.offset], token.offset)
+
+        return tokens
+
+    def parse(self, string):
+        """Parse given remaining string. Returns its tokens with the scanned
+        signals added, or ``None`` if any scanned message definition
+        was not parsed as one, as the scanned signals then may not
+        be signals at all.
+
+        """
+
+        tokens = Parser.parse(self, string)
+
+        # Replace the key, which is any of the equal values.
+        messages = tokens.pop('BO_', [])
+        number_of_scanned_messages = 0
+
+        for message in messages:
+            if type(message[0]) is ScannedMessage:
+                message[6] = message[0].signals + message[6]
+                message[0] = 'BO_'
+                number_of_scanned_messages += 1
+
+        if number_of_scanned_messages != len(self._messages):
+            return None
+
+        if messages:
+            tokens['BO_'] = messages
+
+        return tokens
+
+
+def _scan_messages(string):
+    """Scan given string for signal definitions following message
+    definitions, which are usually most of a DBC file, faster than the
+    parser does. Returns the string with the scanned signal
+    definitions replaced by newlines, and a dictionary of offsets of
+    the message definitions in it to their :class:`ScannedMessage`
+    values.
+
+    """
+
+    remaining = []
+    messages = {}
+    position = 0
+    size = 0
+
+    for message_mo in RE_MESSAGE.finditer(string):
+        signals = []
+        end = message_mo.end()
+
+        while True:
+            signal_mo = RE_SIGNAL.match(string, end)
+
+            if signal_mo is None:
+                break
+
+            signal = _scan_signal(signal_mo)
+
+            if signal is None:
+                break
+
+            signals.append(signal)
+            end = signal_mo.end()
+
+        if not signals:
+            continue
+
+        # Keep the message definition, and line numbers.
+        start = message_mo.start()
+        message_end = message_mo.end()
+        messages[size + start - position] = ScannedMessage(signals)
+        remaining.append(string[position:message_end])
+        remaining.append('\n' * string.count('\n', message_end, end))
+        size += (message_end - position + len(remaining[-1]))
+        position = end
+
+    remaining.append(string[position:])
+
+    return ''.join(remaining), messages
+
+
+def _parse_remaining(remaining, messages):
+    """Parse given remaining string with given scanned messages. Returns
+    its tokens, or ``None`` if the whole string must be parsed by the
+    parser.
+
+    """
+
+    if not messages:
+        return None
+
+    try:
+        return RemainingParser(messages).parse(remaining)
+    except (textparser.ParseError, TokenizeError):
+        return None
+
+
+def _parse(string):
+    """Parse given string. Signal definitions following message
+    definitions are scanned if possible, and everything else is parsed
+    by the parser. Gives the same result as the parser, which parses
+    the whole string if what remains can not be parsed.
+
+    """
+
+    tokens = _parse_remaining(*_scan_messages(string))
+
+    if tokens is None:
+        tokens = Parser().parse(string)
+
+    return tokens
+
+
+class FileParser(object):
+    """Parses a DBC file-like object read line by line. Signal
+    definitions following message definitions are scanned as when
+    parsing a string, so they are not kept in memory as text. All
+    other lines, for example comments, attributes and choices, are
+    kept in memory and parsed by the parser in one go at the end of
+    the file. If they can not be parsed, the file is read again and
+    parsed as a whole by the parser, to raise the same error.
+
+    """
+
+    def __init__(self):
+        self._lines = []
+        self._size = 0
+        self._messages = {}
+        self._message = None
+
+    def parse(self, fp):
+        """Parse given file-like object and return its tokens as parsed by
+        the parser. The file is read again and parsed by the parser if
+        what remains can not be parsed, so it is read into a string at
+        once if its position can not be restored.
+
+        """
+
+        try:
+            position = fp.tell()
+        except (AttributeError, IOError, OSError):
+            return _parse(fp.read())
+
+        for line in fp:
+            if self._message is not None:
+                if self._scan_signal(line):
+                    continue
+
+                if not line.strip(' \t\r\n'):
+                    self._append(line)
+
+                    continue
+
+                self._message = None
+
+            if RE_MESSAGE.match(line):
+                self._message = (self._size, [])
+
+            self._append(line)
+
+        remaining = ''.join(self._lines)
+        self._lines = []
+        tokens = _parse_remaining(remaining, self._messages)
+
+        if tokens is None:
+            if self._messages:
+                del remaining
+                fp.seek(position)
+                remaining = fp.read()
+
+            tokens = Parser().parse(remaining)
+
+        return tokens
+
+    def _scan_signal(self, line):
+        signal_mo = RE_SIGNAL_LINE.match(line)
+
+        if signal_mo is None:
+            return False
+
+        signal = _scan_signal(signal_mo)
+
+        if signal is None:
+            return False
+
+        offset, signals = self._message
+
+        if not signals:
+            self._messages[offset] = ScannedMessage(signals)
+
+        signals.append(signal)
+
+        return True
+
+    def _append(self, line):
+        self._lines.append(line)
+        self._size += len(line)
+
+
 class DbcSpecifics(object):
 
+    __slots__ = ('_attributes', '_attribute_definitions', '_value_tables')
+
     def __init__(self,
                  attributes=None,
                  attribute_definitions=None,
@@ -319,9 +609,8 @@ class DbcSpecifics(object):
         self._attributes = attributes
         self._attribute_definitions = attribute_definitions
 
-        if value_tables is None:
-            value_tables = odict()
-
+        # Created on first access, as only the database level specifics
+        # has value tables.
         self._value_tables = value_tables
 
     @property
@@ -348,6 +637,9 @@ class DbcSpecifics(object):
 
         """
 
+        if self._value_tables is None:
+            self._value_tables = odict()
+
         return self._value_tables
 
 
@@ -405,6 +697,23 @@ def get_dbc_frame_id(message):
     return frame_id
 
 
+def _get_attribute_values(attributes):
+    """Returns given attribute, or dictionary of attributes, with
+    attributes replaced by their values.
+
+    """
+
+    if attributes is None:
+        return None
+    elif isinstance(attributes, Attribute):
+        return attributes.value
+    else:
+        return {
+            name: _get_attribute_values(attribute)
+            for name, attribute in attributes.items()
+        }
+
+
 def _get_node_name(attributes, name):
     try:
         return attributes['node'][name]['SystemNodeLongSymbol'].value
@@ -858,7 +1167,8 @@ def _load_signals(tokens,
                   signal_types,
                   signal_multiplexer_values,
                   frame_id_dbc,
-                  multiplexer_signal):
+                  multiplexer_signal,
+                  decimals):
     signal_to_multiplexer = {}
 
     try:
@@ -956,17 +1266,31 @@ def _load_signals(tokens,
         else:
             return num(maximum)
 
+    def get_decimal(value):
+        """Get given value as a decimal. Decimals are immutable, so equal
+        values are shared between signals.
+
+        """
+
+        try:
+            return decimals[value]
+        except KeyError:
+            decimal = Decimal(value)
+            decimals[value] = decimal
+
+            return decimal
+
     def get_minimum_decimal(minimum, maximum):
         if minimum == maximum == '0':
             return None
         else:
-            return Decimal(minimum)
+            return get_decimal(minimum)
 
     def get_maximum_decimal(minimum, maximum):
         if minimum == maximum == '0':
             return None
         else:
-            return Decimal(maximum)
+            return get_decimal(maximum)
 
     def get_is_float(frame_id_dbc, signal):
         """Get is_float for given signal.
@@ -1002,8 +1326,8 @@ def _load_signals(tokens,
                    offset=num(signal[12]),
                    minimum=get_minimum(signal[15], signal[17]),
                    maximum=get_maximum(signal[15], signal[17]),
-                   decimal=SignalDecimal(Decimal(signal[10]),
-                                         Decimal(signal[12]),
+                   decimal=SignalDecimal(get_decimal(signal[10]),
+                                         get_decimal(signal[12]),
                                          get_minimum_decimal(signal[15],
                                                              signal[17]),
                                          get_maximum_decimal(signal[15],
@@ -1034,8 +1358,10 @@ def _load_messages(tokens,
                    message_senders,
                    signal_types,
                    signal_multiplexer_values,
-                   strict):
-    """Load messages.
+                   strict,
+                   lazy):
+    """Load messages. If `lazy` is ``True``, messages are loaded when
+    first used.
 
     """
 
@@ -1123,15 +1449,7 @@ def _load_messages(tokens,
         except (KeyError, TypeError):
             return name
 
-    messages = []
-
-    for message in tokens.get('BO_', []):
-        # Any message named VECTOR__INDEPENDENT_SIG_MSG contains
-        # signals not assigned to any message. Cantools does not yet
-        # support unassigned signals. Discard them for now.
-        if message[2] == 'VECTOR__INDEPENDENT_SIG_MSG':
-            continue
-
+    def load_message(message):
         # Frame id.
         frame_id_dbc = int(message[1])
         frame_id = frame_id_dbc & 0x7fffffff
@@ -1167,23 +1485,82 @@ def _load_messages(tokens,
                                 signal_types,
                                 signal_multiplexer_values,
                                 frame_id_dbc,
-                                multiplexer_signal)
-
-        messages.append(
-            Message(frame_id=frame_id,
-                    is_extended_frame=is_extended_frame,
-                    name=get_message_name(frame_id_dbc, message[2]),
-                    length=int(message[4], 0),
-                    senders=senders,
-                    send_type=get_send_type(frame_id_dbc),
-                    cycle_time=get_cycle_time(frame_id_dbc),
-                    dbc_specifics=DbcSpecifics(
-                        attributes=get_attributes(frame_id_dbc),
-                        attribute_definitions=definitions),
-                    signals=signals,
-                    comment=get_comment(frame_id_dbc),
-                    strict=strict,
-                    protocol=get_protocol(frame_id_dbc)))
+                                multiplexer_signal,
+                                decimals)
+
+        return Message(frame_id=frame_id,
+                       is_extended_frame=is_extended_frame,
+                       name=get_message_name(frame_id_dbc, message[2]),
+                       length=int(message[4], 0),
+                       senders=senders,
+                       send_type=get_send_type(frame_id_dbc),
+                       cycle_time=get_cycle_time(frame_id_dbc),
+                       dbc_specifics=DbcSpecifics(
+                           attributes=get_attributes(frame_id_dbc),
+                           attribute_definitions=definitions),
+                       signals=signals,
+                       comment=get_comment(frame_id_dbc),
+                       strict=strict,
+                       protocol=get_protocol(frame_id_dbc))
+
+    def get_definition(frame_id_dbc, message):
+        """Get a key of everything given message is loaded from.
+
+        """
+
+        return (message,
+                comments.get(frame_id_dbc),
+                _get_attribute_values(attributes.get(frame_id_dbc)),
+                choices.get(frame_id_dbc),
+                message_senders.get(frame_id_dbc),
+                signal_types.get(frame_id_dbc),
+                signal_multiplexer_values.get(frame_id_dbc),
+                database_definition)
+
+    messages = []
+    decimals = {}
+
+    if lazy:
+        # Attribute definitions and node attributes are used by all
+        # messages.
+        database_definition = (
+            [
+                (definition.name,
+                 definition.kind,
+                 definition.type_name,
+                 definition.minimum,
+                 definition.maximum,
+                 definition.choices,
+                 definition.default_value)
+                for definition in definitions.values()
+            ],
+            _get_attribute_values(attributes['node']))
+
+    # Message tokens are released once loaded, as they use about as
+    # much memory as the loaded messages.
+    message_tokens = tokens.pop('BO_', [])
+    message_tokens.reverse()
+
+    while message_tokens:
+        message = message_tokens.pop()
+
+        # Any message named VECTOR__INDEPENDENT_SIG_MSG contains
+        # signals not assigned to any message. Cantools does not yet
+        # support unassigned signals. Discard them for now.
+        if message[2] == 'VECTOR__INDEPENDENT_SIG_MSG':
+            continue
+
+        if lazy:
+            frame_id_dbc = int(message[1])
+            messages.append(
+                LazyMessage(frame_id=frame_id_dbc & 0x7fffffff,
+                            is_extended_frame=bool(frame_id_dbc & 0x80000000),
+                            name=get_message_name(frame_id_dbc, message[2]),
+                            protocol=get_protocol(frame_id_dbc),
+                            load=partial(load_message, message),
+                            definition=get_definition(frame_id_dbc, message)))
+        else:
+            messages.append(load_message(message))
 
     return messages
 
@@ -1271,12 +1648,36 @@ def get_definitions_dict(definitions, defaults):
     return result
 
 
-def load_string(string, strict=True):
+def parse_string(string):
+    """Parse given string and return its definitions, which may be
+    pickled and are loaded by :func:`load_definitions()`.
+
+    """
+
+    return _parse(string)
+
+
+def load_string(string, strict=True, lazy=False):
     """Parse given string.
 
     """
 
-    tokens = Parser().parse(string)
+    return load_definitions(parse_string(string), strict, lazy)
+
+
+def load(fp, strict=True, lazy=False):
+    """Parse given file-like object read line by line. See
+    :class:`FileParser`.
+
+    """
+
+    return load_definitions(FileParser().parse(fp), strict, lazy)
+
+
+def load_definitions(tokens, strict=True, lazy=False):
+    """Load definitions returned by :func:`parse_string()`.
+
+    """
 
     comments = _load_comments(tokens)
     definitions = _load_attribute_definitions(tokens)
@@ -1296,7 +1697,8 @@ def load_string(string, strict=True):
                               message_senders,
                               signal_types,
                               signal_multiplexer_values,
-                              strict)
+                              strict,
+                              lazy)
     nodes = _load_nodes(tokens, comments, attributes, attribute_definitions)
     version = _load_version(tokens)
     dbc_specifics = DbcSpecifics(attributes=attributes.get('database', None),
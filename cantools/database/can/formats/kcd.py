@@ -453,8 +453,9 @@ def dump_string(database):
         return ElementTree.tostring(network_definition)
 
 
-def load_string(string, strict=True):
-    """Parse given KCD format string.
+def parse_string(string):
+    """Parse given KCD format string and return its root element, which
+    may be pickled and is loaded by :func:`load_definitions()`.
 
     """
 
@@ -466,6 +467,22 @@ def load_string(string, strict=True):
             'Expected root element tag {}, but got {}.'.format(ROOT_TAG,
                                                                root.tag))
 
+    return root
+
+
+def load_string(string, strict=True):
+    """Parse given KCD format string.
+
+    """
+
+    return load_definitions(parse_string(string), strict)
+
+
+def load_definitions(root, strict=True):
+    """Load given root element returned by :func:`parse_string()`.
+
+    """
+
     nodes = [node.attrib for node in root.findall('./ns:Node', NAMESPACES)]
     buses = []
     messages = []
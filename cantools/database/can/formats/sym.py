@@ -465,15 +465,30 @@ def _load_version(tokens):
     return tokens[0][1]
 
 
-def load_string(string, strict=True):
-    """Parse given string.
+def parse_string(string):
+    """Parse given string and return its definitions, which may be
+    pickled and are loaded by :func:`load_definitions()`.
 
     """
 
     if not string.startswith('FormatVersion=6.0'):
         raise ParseError('Only SYM version 6.0 is supported.')
 
-    tokens = Parser60().parse(string)
+    return Parser60().parse(string)
+
+
+def load_string(string, strict=True):
+    """Parse given string.
+
+    """
+
+    return load_definitions(parse_string(string), strict)
+
+
+def load_definitions(tokens, strict=True):
+    """Load definitions returned by :func:`parse_string()`.
+
+    """
 
     version = _load_version(tokens)
     enums = _load_enums(tokens)
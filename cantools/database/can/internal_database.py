@@ -16,3 +16,32 @@ class InternalDatabase(object):
         self.buses = buses
         self.version = version
         self.dbc = dbc_specifics
+
+
+class LazyMessage(object):
+    """A message that is not yet loaded. Only has the attributes needed
+    to find it in a database. Call `load()` to load the message.
+
+    `definition` is a key of the parsed definition of the message,
+    which is equal for messages loaded from equal definitions, but
+    not hashable.
+
+    `index` is the index of the message in the list of messages of
+    the database it is added to.
+
+    """
+
+    def __init__(self,
+                 frame_id,
+                 is_extended_frame,
+                 name,
+                 protocol,
+                 load,
+                 definition=None):
+        self.frame_id = frame_id
+        self.is_extended_frame = is_extended_frame
+        self.name = name
+        self.protocol = protocol
+        self.load = load
+        self.definition = definition
+        self.index = None
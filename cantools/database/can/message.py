@@ -1,16 +1,30 @@
 # A CAN message.
 
-import binascii
-from copy import deepcopy
+from collections import namedtuple
 
 from ..utils import format_or
+from ..utils import format_and
 from ..utils import start_bit
 from ..utils import encode_data
 from ..utils import decode_data
+from ..utils import decode_data_columns
+from ..utils import decode_data_array
+from ..utils import encode_data_array
+from ..utils import create_encode_fields
+from ..utils import create_encode_masks
+from ..utils import create_decode_fields
 from ..utils import create_encode_decode_formats
 from ..errors import Error
 from ..errors import EncodeError
 from ..errors import DecodeError
+from ..errors import DECODE_ERROR_DATA_TOO_SHORT
+from ..errors import DECODE_ERROR_BAD_MULTIPLEXER_ID
+from ...compat import int_from_bytes
+from ...compat import int_to_bytes
+
+
+# Maximum number of views cached by Message.decode().
+VIEWS_CACHE_MAXSIZE = 64
 
 
 class Message(object):
@@ -22,6 +36,13 @@ class Message(object):
 
     """
 
+    __slots__ = ('_frame_id', '_is_extended_frame', '_name', '_length',
+                 '_signals', '_comment', '_senders', '_send_type',
+                 '_cycle_time', '_dbc', '_bus_name', '_name_to_signal',
+                 '_codecs', '_signal_tree', '_views', '_row_codec',
+                 '_row_type', '_update_codec', '_strict', '_protocol',
+                 '_modified', '_refreshed')
+
     def __init__(self,
                  frame_id,
                  name,
@@ -48,40 +69,62 @@ class Message(object):
         self._cycle_time = cycle_time
         self._dbc = dbc_specifics
         self._bus_name = bus_name
+        self._name_to_signal = {}
         self._codecs = None
         self._signal_tree = None
+        self._views = {}
+        self._row_codec = None
+        self._row_type = None
+        self._update_codec = None
         self._strict = strict
         self._protocol = protocol
+        self._modified = True
+        self._refreshed = None
         self.refresh()
 
-    def _create_codec(self, parent_signal=None, multiplexer_id=None):
-        """Create a codec of all signals with given parent signal. This is a
-        recursive function.
+    def _create_signals_index(self):
+        """Returns a dictionary of parent signal names and multiplexer ids to
+        lists of child signals, and a dictionary of multiplexer signal
+        names to lists of multiplexer ids. Root signals' parent and
+        multiplexer id are both None.
 
         """
 
-        signals = []
-        multiplexers = {}
+        children = {}
+        children_ids = {}
 
-        # Find all signals matching given parent signal name and given
-        # multiplexer id. Root signals' parent and multiplexer id are
-        # both None.
         for signal in self._signals:
-            if signal.multiplexer_signal != parent_signal:
-                continue
+            parent_signal = signal.multiplexer_signal
 
-            if ((multiplexer_id is not None)
-                and (multiplexer_id not in signal.multiplexer_ids)):
-                continue
+            if parent_signal is None:
+                keys = [(None, None)]
+            else:
+                multiplexer_ids = (signal.multiplexer_ids or [])
+                keys = [(parent_signal, mux) for mux in set(multiplexer_ids)]
+                children_ids.setdefault(parent_signal, []).extend(
+                    multiplexer_ids)
 
-            if signal.is_multiplexer:
-                children_ids = set()
+            for key in keys:
+                children.setdefault(key, []).append(signal)
+
+        return children, children_ids
 
-                for s in self._signals:
-                    if s.multiplexer_signal != signal.name:
-                        continue
+    def _create_codec(self,
+                      children,
+                      children_ids,
+                      parent_signal=None,
+                      multiplexer_id=None):
+        """Create a codec of all signals with given parent signal. This is a
+        recursive function.
+
+        """
 
-                    children_ids.update(s.multiplexer_ids)
+        signals = children.get((parent_signal, multiplexer_id), [])
+        multiplexers = {}
+
+        for signal in signals:
+            if signal.is_multiplexer:
+                signal_children_ids = set(children_ids.get(signal.name, []))
 
                 # Some CAN messages will have muxes containing only
                 # the multiplexer and no additional signals. At Tesla
@@ -90,22 +133,26 @@ class Message(object):
                 # multiplexer is included, even if it has no child
                 # signals.
                 if signal.choices:
-                    children_ids.update(signal.choices.keys())
+                    signal_children_ids.update(signal.choices.keys())
 
-                for child_id in children_ids:
-                    codec = self._create_codec(signal.name, child_id)
+                for child_id in signal_children_ids:
+                    codec = self._create_codec(children,
+                                               children_ids,
+                                               signal.name,
+                                               child_id)
 
                     if signal.name not in multiplexers:
                         multiplexers[signal.name] = {}
 
                     multiplexers[signal.name][child_id] = codec
 
-            signals.append(signal)
+        formats = create_encode_decode_formats(signals, self._length)
 
         return {
             'signals': signals,
-            'formats': create_encode_decode_formats(signals,
-                                                    self._length),
+            'formats': formats,
+            'encode_fields': create_encode_fields(signals, formats),
+            'decode_fields': create_decode_fields(signals, formats),
             'multiplexers': multiplexers
         }
 
@@ -134,6 +181,121 @@ class Message(object):
 
         return nodes
 
+    def _create_view_codec(self, codec, signal_names):
+        """Create a codec of given codec with given signals and the
+        multiplexers needed to reach them. This is a recursive
+        function.
+
+        """
+
+        multiplexers = {}
+
+        for signal, mux_codecs in codec['multiplexers'].items():
+            view_codecs = {
+                mux: self._create_view_codec(mux_codec, signal_names)
+                for mux, mux_codec in mux_codecs.items()
+            }
+
+            # All multiplexer ids are kept if any signal is wanted, to
+            # raise the same error as a full decode for unknown ids.
+            if any(view_codec['decode_fields']
+                   for view_codec in view_codecs.values()):
+                multiplexers[signal] = view_codecs
+
+        decode_fields = tuple([
+            field
+            for field in codec['decode_fields']
+            if field[0] in signal_names or field[0] in multiplexers
+        ])
+
+        return {
+            'formats': codec['formats'],
+            'decode_fields': decode_fields,
+            'multiplexers': multiplexers
+        }
+
+    def _create_row_codec(self, codec, positions):
+        """Create a codec of given codec that stores decoded values at
+        given row positions of the signals. This is a recursive
+        function.
+
+        """
+
+        return {
+            'formats': codec['formats'],
+            'decode_fields': tuple([
+                (positions[field[0]],) + field[1:]
+                for field in codec['decode_fields']
+            ]),
+            'multiplexers': [
+                (positions[signal],
+                 self._name_to_signal[signal],
+                 {
+                     mux: self._create_row_codec(mux_codec, positions)
+                     for mux, mux_codec in mux_codecs.items()
+                 })
+                for signal, mux_codecs in codec['multiplexers'].items()
+            ]
+        }
+
+    def _get_row_codec(self):
+        """Returns the row codec, created on first use.
+
+        """
+
+        if self._row_codec is None:
+            names = []
+            positions = {}
+
+            for signal in self._signals:
+                if signal.name not in positions:
+                    positions[signal.name] = len(names)
+                    names.append(signal.name)
+
+            self._row_codec = self._create_row_codec(self._codecs, positions)
+            self._row_type = namedtuple('Row', names, rename=True)
+
+        return self._row_codec
+
+    def _create_update_codec(self, codec):
+        """Create a codec of given codec used to update signals in encoded
+        data. This is a recursive function.
+
+        """
+
+        fields = {}
+
+        for signal, encode_field, mask in zip(
+                codec['signals'],
+                codec['encode_fields'],
+                create_encode_masks(codec['formats'])):
+            fields[signal.name] = (encode_field, ~mask)
+
+        multiplexers = {
+            signal: {
+                mux: self._create_update_codec(mux_codec)
+                for mux, mux_codec in mux_codecs.items()
+            }
+            for signal, mux_codecs in codec['multiplexers'].items()
+        }
+        names = set(fields)
+
+        for mux_codecs in multiplexers.values():
+            for mux_codec in mux_codecs.values():
+                names |= mux_codec['names']
+
+        return {
+            'formats': codec['formats'],
+            'decode_fields': tuple([
+                field
+                for field in codec['decode_fields']
+                if field[0] in multiplexers
+            ]),
+            'fields': fields,
+            'multiplexers': multiplexers,
+            'names': names
+        }
+
     @property
     def frame_id(self):
         """The message frame id.
@@ -181,6 +343,7 @@ class Message(object):
     @length.setter
     def length(self, value):
         self._length = value
+        self._modified = True
 
     @property
     def signals(self):
@@ -259,6 +422,18 @@ class Message(object):
     def protocol(self, value):
         self._protocol = value
 
+    @property
+    def row_type(self):
+        """The named tuple class returned by :meth:`decode_row()`, with one
+        field per signal name in signal order. Signal names that are
+        not valid identifiers are replaced by positional names.
+
+        """
+
+        self._get_row_codec()
+
+        return self._row_type
+
     @property
     def signal_tree(self):
         """All signal names and multiplexer ids as a tree. Multiplexer signals
@@ -660,7 +835,7 @@ class Message(object):
             self._check_signals(node['signals'], data, scaling)
 
         encoded = encode_data(data,
-                              node['signals'],
+                              node['encode_fields'],
                               node['formats'],
                               scaling)
         padding_mask = node['formats'].padding_mask
@@ -709,14 +884,280 @@ class Message(object):
         if padding:
             encoded |= padding_mask
 
-        encoded |= (0x80 << (8 * self._length))
-        encoded = hex(encoded)[4:].rstrip('L')
+        return int_to_bytes(encoded, self._length, 'big')
+
+    def _find_update_node(self, node, data, name):
+        """Returns the update codec node of given signal name `name` in the
+        multiplexed parts of given data, or ``None`` if the signal is
+        not in the data. This is a recursive function.
+
+        """
+
+        if name in node['fields']:
+            return node
+
+        if name not in node['names']:
+            return None
+
+        multiplexers = node['multiplexers']
+        decoded = decode_data(data,
+                              node['decode_fields'],
+                              node['formats'],
+                              False,
+                              True)
+
+        for signal in multiplexers:
+            mux = decoded[signal]
+
+            try:
+                mux_node = multiplexers[signal][mux]
+            except KeyError:
+                raise EncodeError('expected multiplexer id {}, but got {}'.format(
+                    format_or(multiplexers[signal]),
+                    mux))
+
+            mux_node = self._find_update_node(mux_node, data, name)
+
+            if mux_node is not None:
+                return mux_node
+
+        return None
+
+    def encode_update(self, data, signals, scaling=True, strict=True):
+        """Encode given dictionary of signal names and values `signals` into
+        given previously encoded data `data` of this message
+        type. Only the bits of given signals are modified, which is
+        faster than encoding all signals of a large message.
+
+        Signals not in the multiplexed parts of `data` are
+        ignored. Multiplexers can not be updated, as they select other
+        signals. If `strict` is ``True`` an exception is raised if a
+        signal is not in the message, otherwise such signals are
+        ignored.
 
-        return binascii.unhexlify(encoded)[:self._length]
+        See :meth:`encode()` for descriptions of other arguments.
+
+        >>> foo = db.get_message_by_name('Foo')
+        >>> foo.encode_update(b'\\x01\\x45\\x23\\x00\\x11', {'Fum': 5.25})
+        b'\\x01\\x45\\x23\\x00\\x13'
+
+        """
+
+        if len(data) < self._length:
+            raise EncodeError(
+                'Expected at least {} bytes of data, but got {}.'.format(
+                    self._length,
+                    len(data)))
+
+        data = data[:self._length]
+
+        if self._update_codec is None:
+            self._update_codec = self._create_update_codec(self._codecs)
+
+        encoded = int_from_bytes(data, 'big')
+
+        for name in signals:
+            if strict and name not in self._name_to_signal:
+                raise EncodeError(
+                    "Expected a signal of message '{}', but got '{}'.".format(
+                        self._name,
+                        name))
+
+            node = self._find_update_node(self._update_codec, data, name)
+
+            if node is None:
+                continue
+
+            if name in node['multiplexers']:
+                raise EncodeError(
+                    "Expected a signal, but got multiplexer '{}'.".format(name))
+
+            encode_field, clear_mask = node['fields'][name]
+
+            if strict and scaling:
+                self._check_signals_ranges_scaling([encode_field[1]], signals)
+
+            encoded &= clear_mask
+            encoded |= encode_data(signals,
+                                   (encode_field,),
+                                   node['formats'],
+                                   scaling)
+
+        return int_to_bytes(encoded, self._length, 'big')
+
+    def _check_signals_array(self, signals, data, scaling):
+        for signal in signals:
+            if signal.name not in data:
+                raise EncodeError(
+                    "Expected signal value for '{}' in data, but got {}.".format(
+                        signal.name,
+                        data))
+
+        if not scaling:
+            return
+
+        for signal in signals:
+            values = data[signal.name]
+
+            if signal.minimum is not None:
+                invalid = (values < signal.minimum)
+
+                if invalid.any():
+                    raise EncodeError(
+                        "Expected signal '{}' value greater than or equal to "
+                        "{} in message '{}', but got {}.".format(
+                            signal.name,
+                            signal.minimum,
+                            self._name,
+                            values[invalid.argmax()].item()))
+
+            if signal.maximum is not None:
+                invalid = (values > signal.maximum)
+
+                if invalid.any():
+                    raise EncodeError(
+                        "Expected signal '{}' value less than or equal to "
+                        "{} in message '{}', but got {}.".format(
+                            signal.name,
+                            signal.maximum,
+                            self._name,
+                            values[invalid.argmax()].item()))
+
+    def _encode_array(self,
+                      node,
+                      data,
+                      rows,
+                      encoded,
+                      padding_masks,
+                      scaling,
+                      strict):
+        import numpy
+
+        if rows is None:
+            node_data = data
+            number_of_datas = len(encoded)
+        else:
+            node_data = {
+                signal.name: data[signal.name][rows]
+                for signal in node['signals']
+                if signal.name in data
+            }
+            number_of_datas = len(rows)
+
+        if strict:
+            self._check_signals_array(node['signals'], node_data, scaling)
+
+        node_encoded = encode_data_array(node_data,
+                                         number_of_datas,
+                                         node['encode_fields'],
+                                         node['formats'],
+                                         scaling)
+
+        if rows is None:
+            encoded |= node_encoded
+        else:
+            encoded[rows] |= node_encoded
+
+        if padding_masks is not None:
+            padding_mask = numpy.frombuffer(
+                int_to_bytes(node['formats'].padding_mask, self._length, 'big'),
+                dtype=numpy.uint8)
+
+            if rows is None:
+                padding_masks &= padding_mask
+            else:
+                padding_masks[rows] &= padding_mask
+
+        multiplexers = node['multiplexers']
+
+        for signal in multiplexers:
+            muxes = data[signal]
+
+            if rows is not None:
+                muxes = muxes[rows]
+
+            for mux in numpy.unique(muxes):
+                mux = int(mux)
+
+                try:
+                    mux_node = multiplexers[signal][mux]
+                except KeyError:
+                    raise EncodeError(
+                        'expected multiplexer id {}, but got {}'.format(
+                            format_or(multiplexers[signal]),
+                            mux))
+
+                mux_rows = numpy.flatnonzero(muxes == mux)
+
+                if rows is not None:
+                    mux_rows = rows[mux_rows]
+
+                self._encode_array(mux_node,
+                                   data,
+                                   mux_rows,
+                                   encoded,
+                                   padding_masks,
+                                   scaling,
+                                   strict)
+
+    def encode_array(self, data, scaling=True, padding=False, strict=True):
+        """Encode given dictionary of signal names and NumPy arrays as
+        messages of this type, one message per array index. Returns a
+        two dimensional NumPy array of payloads, one payload per
+        row. Choice strings are not supported, and multiplexer signal
+        values must be multiplexer ids.
+
+        See :meth:`.encode()` for descriptions of other arguments.
+
+        This method requires NumPy.
+
+        >>> foo = db.get_message_by_name('Foo')
+        >>> foo.encode_array({'Bar': numpy.array([1, 0]),
+        ...                   'Fum': numpy.array([5.0, 5.25])})
+        array([[ 1, 69, 35,  0, 17],
+               [ 0, 69, 35,  0, 19]], dtype=uint8)
+
+        """
+
+        import numpy
+
+        data = {name: numpy.asarray(values) for name, values in data.items()}
+        lengths = set([len(values) for values in data.values()])
+
+        if len(lengths) > 1:
+            raise EncodeError(
+                'Expected arrays of equal lengths, but got lengths {}.'.format(
+                    format_and(sorted(lengths))))
+
+        if data:
+            number_of_datas = lengths.pop()
+        else:
+            number_of_datas = 0
+
+        encoded = numpy.zeros((number_of_datas, self._length),
+                              dtype=numpy.uint8)
+
+        if padding:
+            padding_masks = numpy.full(encoded.shape, 0xff, dtype=numpy.uint8)
+        else:
+            padding_masks = None
+
+        self._encode_array(self._codecs,
+                           data,
+                           None,
+                           encoded,
+                           padding_masks,
+                           scaling,
+                           strict)
+
+        if padding:
+            encoded |= padding_masks
+
+        return encoded
 
     def _decode(self, node, data, decode_choices, scaling):
         decoded = decode_data(data,
-                              node['signals'],
+                              node['decode_fields'],
                               node['formats'],
                               decode_choices,
                               scaling)
@@ -740,7 +1181,20 @@ class Message(object):
 
         return decoded
 
-    def decode(self, data, decode_choices=True, scaling=True):
+    def _get_data(self, data, offset):
+        if offset:
+            data = memoryview(data)[offset:offset + self._length]
+        elif len(data) > self._length:
+            data = data[:self._length]
+
+        return data
+
+    def decode(self,
+               data,
+               decode_choices=True,
+               scaling=True,
+               offset=0,
+               signals=None):
         """Decode given data as a message of this type.
 
         If `decode_choices` is ``False`` scaled values are not
@@ -748,22 +1202,349 @@ class Message(object):
 
         If `scaling` is ``False`` no scaling of signals is performed.
 
+        If `offset` is non-zero the message is decoded from given
+        offset in `data`, which may be any bytes-like object, for
+        example a bytearray or a memoryview of a receive buffer. The
+        data is not copied.
+
+        If `signals` is a list of signal names only those signals are
+        decoded, see :meth:`create_view()`.
+
         >>> foo = db.get_message_by_name('Foo')
         >>> foo.decode(b'\\x01\\x45\\x23\\x00\\x11')
         {'Bar': 1, 'Fum': 5.0}
+        >>> foo.decode(bytearray(b'\\xff\\x01\\x45\\x23\\x00\\x11'), offset=1)
+        {'Bar': 1, 'Fum': 5.0}
+        >>> foo.decode(b'\\x01\\x45\\x23\\x00\\x11', signals=['Fum'])
+        {'Fum': 5.0}
 
         """
 
-        data = data[:self._length]
+        if signals is not None:
+            key = tuple(signals)
+
+            try:
+                view = self._views[key]
+            except KeyError:
+                if len(self._views) >= VIEWS_CACHE_MAXSIZE:
+                    self._views.clear()
+
+                view = self.create_view(signals)
+                self._views[key] = view
+
+            return view.decode(data, decode_choices, scaling, offset)
+
+        data = self._get_data(data, offset)
 
         return self._decode(self._codecs, data, decode_choices, scaling)
 
-    def get_signal_by_name(self, name):
-        for signal in self._signals:
-            if signal.name == name:
-                return signal
+    def _try_decode(self, node, data, decode_choices, scaling):
+        if 8 * len(data) < node['formats'].number_of_bits:
+            return None, DECODE_ERROR_DATA_TOO_SHORT
+
+        decoded = decode_data(data,
+                              node['decode_fields'],
+                              node['formats'],
+                              decode_choices,
+                              scaling)
+
+        multiplexers = node['multiplexers']
+
+        for signal in multiplexers:
+            mux = self._get_mux_number(decoded, signal)
+            node = multiplexers[signal].get(mux)
+
+            if node is None:
+                return None, DECODE_ERROR_BAD_MULTIPLEXER_ID
+
+            mux_decoded, error = self._try_decode(node,
+                                                  data,
+                                                  decode_choices,
+                                                  scaling)
+
+            if error is not None:
+                return None, error
 
-        raise KeyError(name)
+            decoded.update(mux_decoded)
+
+        return decoded, None
+
+    def try_decode(self, data, decode_choices=True, scaling=True, offset=0):
+        """Same as :meth:`decode()`, but returns a tuple of the decoded
+        signals and ``None``, or ``None`` and an error code if the
+        data can not be decoded, instead of raising an exception.
+
+        The error codes are
+        :data:`~cantools.database.errors.DECODE_ERROR_DATA_TOO_SHORT`
+        and
+        :data:`~cantools.database.errors.DECODE_ERROR_BAD_MULTIPLEXER_ID`.
+
+        >>> foo = db.get_message_by_name('Foo')
+        >>> foo.try_decode(b'\\x01\\x45\\x23\\x00\\x11')
+        ({'Bar': 1, 'Fum': 5.0}, None)
+        >>> foo.try_decode(b'\\x01') == (None, DECODE_ERROR_DATA_TOO_SHORT)
+        True
+
+        """
+
+        data = self._get_data(data, offset)
+
+        return self._try_decode(self._codecs, data, decode_choices, scaling)
+
+    def _decode_row(self, node, data, decode_choices, scaling, row):
+        decode_data(data,
+                    node['decode_fields'],
+                    node['formats'],
+                    decode_choices,
+                    scaling,
+                    row)
+
+        for position, signal, mux_codecs in node['multiplexers']:
+            mux = row[position]
+
+            if isinstance(mux, str):
+                mux = signal.choice_string_to_number(mux)
+
+            try:
+                node = mux_codecs[mux]
+            except KeyError:
+                raise DecodeError('expected multiplexer id {}, but got {}'.format(
+                    format_or(mux_codecs),
+                    mux))
+
+            self._decode_row(node, data, decode_choices, scaling, row)
+
+    def decode_row(self,
+                   data,
+                   row=None,
+                   decode_choices=True,
+                   scaling=True,
+                   offset=0):
+        """Decode given data as a message of this type, without creating a
+        dictionary.
+
+        If `row` is ``None`` the decoded values are returned as a
+        :attr:`row_type` named tuple, with ``None`` for signals not
+        in the decoded multiplexed parts of the message. Otherwise
+        the values are written to given preallocated mutable
+        sequence `row`, for example a list or a row of a NumPy array,
+        in the field order of :attr:`row_type`, and `row` is
+        returned. Values of signals not in the decoded multiplexed
+        parts of the message are not written. Choices are not decoded
+        into rows with a numeric dtype, for example a row of a float
+        NumPy array.
+
+        See :meth:`decode()` for descriptions of other arguments.
+
+        >>> foo = db.get_message_by_name('Foo')
+        >>> foo.decode_row(b'\\x01\\x45\\x23\\x00\\x11')
+        Row(Bar=1, Fum=5.0)
+        >>> row = numpy.zeros(2)
+        >>> foo.decode_row(b'\\x01\\x45\\x23\\x00\\x11', row)
+        array([1., 5.])
+
+        """
+
+        codec = self._get_row_codec()
+        data = self._get_data(data, offset)
+
+        if row is None:
+            values = len(self._row_type._fields) * [None]
+            self._decode_row(codec, data, decode_choices, scaling, values)
+
+            return self._row_type._make(values)
+        else:
+            # Choice strings can not be written to numeric arrays.
+            dtype = getattr(row, 'dtype', None)
+
+            if dtype is not None and dtype.kind in 'biufc':
+                decode_choices = False
+
+            self._decode_row(codec, data, decode_choices, scaling, row)
+
+            return row
+
+    def create_view(self, signals):
+        """Create a view of given list of signal names `signals`, used to
+        decode only those signals and the multiplexers needed to reach
+        them. Decoding a view is faster than decoding all signals of
+        the message.
+
+        Create a new view after refreshing the message.
+
+        >>> foo = db.get_message_by_name('Foo')
+        >>> view = foo.create_view(['Fum'])
+        >>> view.decode(b'\\x01\\x45\\x23\\x00\\x11')
+        {'Fum': 5.0}
+
+        """
+
+        signals = list(signals)
+
+        for name in signals:
+            if name not in self._name_to_signal:
+                raise KeyError(name)
+
+        return MessageView(self,
+                           signals,
+                           self._create_view_codec(self._codecs,
+                                                   frozenset(signals)))
+
+    def _decode_many(self, node, datas, decode_choices, scaling):
+        decoded = decode_data_columns(datas,
+                                      node['decode_fields'],
+                                      node['formats'],
+                                      decode_choices,
+                                      scaling)
+        multiplexers = node['multiplexers']
+
+        for signal in multiplexers:
+            signal_object = self.get_signal_by_name(signal)
+            indexes_per_mux = {}
+
+            for index, mux in enumerate(decoded[signal]):
+                if isinstance(mux, str):
+                    mux = signal_object.choice_string_to_number(mux)
+
+                try:
+                    indexes_per_mux[mux].append(index)
+                except KeyError:
+                    if mux not in multiplexers[signal]:
+                        raise DecodeError(
+                            'expected multiplexer id {}, but got {}'.format(
+                                format_or(multiplexers[signal]),
+                                mux))
+
+                    indexes_per_mux[mux] = [index]
+
+            for mux, indexes in indexes_per_mux.items():
+                mux_decoded = self._decode_many(multiplexers[signal][mux],
+                                                [datas[i] for i in indexes],
+                                                decode_choices,
+                                                scaling)
+
+                for name, values in mux_decoded.items():
+                    if name not in decoded:
+                        decoded[name] = len(datas) * [None]
+
+                    column = decoded[name]
+
+                    for index, value in zip(indexes, values):
+                        column[index] = value
+
+        return decoded
+
+    def decode_many(self, datas, decode_choices=True, scaling=True):
+        """Decode given list of datas as messages of this type. Returns a
+        dictionary of signal names and lists of values, with one value
+        per data. Values of signals not present in a multiplexed
+        message are ``None``.
+
+        See :meth:`.decode()` for descriptions of other arguments.
+
+        >>> foo = db.get_message_by_name('Foo')
+        >>> foo.decode_many([b'\\x01\\x45\\x23\\x00\\x11', b'\\x00\\x45\\x23\\x00\\x13'])
+        {'Bar': [1, 0], 'Fum': [5.0, 5.25]}
+
+        """
+
+        if any([len(data) > self._length for data in datas]):
+            datas = [data[:self._length] for data in datas]
+
+        return self._decode_many(self._codecs, datas, decode_choices, scaling)
+
+    def _decode_array(self, node, payloads, rows, decoded, scaling):
+        import numpy
+
+        if rows is None:
+            node_payloads = payloads
+        else:
+            node_payloads = payloads[rows]
+
+        node_decoded = decode_data_array(node_payloads,
+                                         node['decode_fields'],
+                                         node['formats'],
+                                         scaling)
+
+        for name, values in node_decoded.items():
+            if rows is None:
+                decoded[name] = values
+            else:
+                if name not in decoded:
+                    decoded[name] = numpy.ma.masked_all(len(payloads),
+                                                        dtype=values.dtype)
+
+                decoded[name][rows] = values
+
+        multiplexers = node['multiplexers']
+
+        for signal in multiplexers:
+            fields = [
+                field
+                for field in node['decode_fields']
+                if field[0] == signal
+            ]
+            muxes = decode_data_array(node_payloads,
+                                      fields,
+                                      node['formats'],
+                                      False)[signal]
+
+            for mux in numpy.unique(muxes):
+                mux = int(mux)
+
+                try:
+                    mux_node = multiplexers[signal][mux]
+                except KeyError:
+                    raise DecodeError(
+                        'expected multiplexer id {}, but got {}'.format(
+                            format_or(multiplexers[signal]),
+                            mux))
+
+                mux_rows = numpy.flatnonzero(muxes == mux)
+
+                if rows is not None:
+                    mux_rows = rows[mux_rows]
+
+                self._decode_array(mux_node,
+                                   payloads,
+                                   mux_rows,
+                                   decoded,
+                                   scaling)
+
+    def decode_array(self, payloads, scaling=True):
+        """Decode given two dimensional NumPy array of payloads as
+        messages of this type, one payload per row. Returns a
+        dictionary of signal names and NumPy arrays, with one value
+        per payload. Choices are not decoded.
+
+        Signals in multiplexed parts of the message are returned as
+        masked arrays, where values of signals not present in a
+        payload are masked.
+
+        If `scaling` is ``False`` no scaling of signals is performed.
+
+        This method requires NumPy.
+
+        >>> foo = db.get_message_by_name('Foo')
+        >>> payloads = numpy.array([[1, 0x45, 0x23, 0, 0x11],
+        ...                         [0, 0x45, 0x23, 0, 0x13]],
+        ...                        dtype=numpy.uint8)
+        >>> foo.decode_array(payloads)
+        {'Bar': array([1, 0]), 'Fum': array([5.  , 5.25])}
+
+        """
+
+        import numpy
+
+        payloads = numpy.asarray(payloads, dtype=numpy.uint8)
+        payloads = payloads[:, :self._length]
+        decoded = {}
+        self._decode_array(self._codecs, payloads, None, decoded, scaling)
+
+        return decoded
+
+    def get_signal_by_name(self, name):
+        return self._name_to_signal[name]
 
     def is_multiplexed(self):
         """Returns ``True`` if the message is multiplexed, otherwise
@@ -780,68 +1561,95 @@ class Message(object):
 
         return bool(self._codecs['multiplexers'])
 
-    def _check_signal(self, message_bits, signal):
-        signal_bits = signal.length * [signal.name]
+    def _signal_mask(self, signal):
+        """Returns the bits used by given signal in the message as an
+        integer, with the first message bit as most significant bit,
+        or ``None`` if the signal does not fit in the message.
+
+        """
+
+        number_of_bits = (8 * self._length)
 
         if signal.byte_order == 'big_endian':
-            padding = start_bit(signal) * [None]
-            signal_bits = padding + signal_bits
+            end = (start_bit(signal) + signal.length)
         else:
-            signal_bits += signal.start * [None]
+            end = (signal.start + signal.length)
 
-            if len(signal_bits) < len(message_bits):
-                padding = (len(message_bits) - len(signal_bits)) * [None]
-                reversed_signal_bits = padding + signal_bits
-            else:
-                reversed_signal_bits = signal_bits
+        if end > number_of_bits:
+            return None
+
+        mask = ((1 << signal.length) - 1)
 
-            signal_bits = []
+        if signal.byte_order == 'big_endian':
+            return mask << (number_of_bits - end)
+        else:
+            return int_from_bytes(int_to_bytes(mask << signal.start,
+                                               self._length,
+                                               'little'),
+                                  'big')
 
-            for i in range(0, len(reversed_signal_bits), 8):
-                signal_bits = reversed_signal_bits[i:i + 8] + signal_bits
+    def _check_signal(self, used, owners, masks, signal_name):
+        """Check that given signal fits in the message and does not
+        overlap with the used bits. `owners` is a list of masks and
+        signal names in the order the signals were added. Returns the
+        used bits including the signal.
 
-        # Check that the signal fits in the message.
-        if len(signal_bits) > len(message_bits):
+        """
+
+        mask = masks[signal_name]
+
+        if mask is None:
             raise Error(
                 'The signal {} does not fit in message {}.'.format(
-                    signal.name,
+                    signal_name,
                     self.name))
 
-        # Check that the signal does not overlap with other
-        # signals.
-        for offset, signal_bit in enumerate(signal_bits):
-            if signal_bit is not None:
-                if message_bits[offset] is not None:
-                    raise Error(
-                        'The signals {} and {} are overlapping in message {}.'.format(
-                            signal.name,
-                            message_bits[offset],
-                            self.name))
+        overlapping = (used & mask)
 
-                message_bits[offset] = signal.name
+        if overlapping:
+            # Report the signal last added to the first overlapping
+            # bit.
+            bit = (1 << (overlapping.bit_length() - 1))
 
-    def _check_mux(self, message_bits, mux):
+            for owner_mask, owner_name in reversed(owners):
+                if owner_mask & bit:
+                    break
+
+            raise Error(
+                'The signals {} and {} are overlapping in message {}.'.format(
+                    signal_name,
+                    owner_name,
+                    self.name))
+
+        owners.append((mask, signal_name))
+
+        return used | mask
+
+    def _check_mux(self, used, owners, masks, mux):
         signal_name, children = list(mux.items())[0]
-        self._check_signal(message_bits,
-                           self.get_signal_by_name(signal_name))
-        children_message_bits = deepcopy(message_bits)
+        used = self._check_signal(used, owners, masks, signal_name)
+        children_used = used
+        number_of_owners = len(owners)
 
+        # Children may overlap each other, but not their parents.
         for multiplexer_id in sorted(children):
-            child_tree = children[multiplexer_id]
-            child_message_bits = deepcopy(children_message_bits)
-            self._check_signal_tree(child_message_bits, child_tree)
+            child_owners = owners[:number_of_owners]
+            used |= self._check_signal_tree(children_used,
+                                            child_owners,
+                                            masks,
+                                            children[multiplexer_id])
+            owners.extend(child_owners[number_of_owners:])
 
-            for i, child_bit in enumerate(child_message_bits):
-                if child_bit is not None:
-                    message_bits[i] = child_bit
+        return used
 
-    def _check_signal_tree(self, message_bits, signal_tree):
+    def _check_signal_tree(self, used, owners, masks, signal_tree):
         for signal_name in signal_tree:
             if isinstance(signal_name, dict):
-                self._check_mux(message_bits, signal_name)
+                used = self._check_mux(used, owners, masks, signal_name)
             else:
-                self._check_signal(message_bits,
-                                   self.get_signal_by_name(signal_name))
+                used = self._check_signal(used, owners, masks, signal_name)
+
+        return used
 
     def refresh(self, strict=None):
         """Refresh the internal message state.
@@ -853,15 +1661,79 @@ class Message(object):
 
         """
 
-        self._codecs = self._create_codec()
+        self._name_to_signal = {}
+
+        for signal in self._signals:
+            self._name_to_signal.setdefault(signal.name, signal)
+
+        self._codecs = self._create_codec(*self._create_signals_index())
         self._signal_tree = self._create_signal_tree(self._codecs)
+        self._views = {}
+        self._row_codec = None
+        self._row_type = None
+        self._update_codec = None
 
         if strict is None:
             strict = self._strict
 
         if strict:
-            message_bits = 8 * self.length * [None]
-            self._check_signal_tree(message_bits, self.signal_tree)
+            masks = {
+                name: self._signal_mask(signal)
+                for name, signal in self._name_to_signal.items()
+            }
+            self._check_signal_tree(0, [], masks, self.signal_tree)
+
+        # Multiplexer choices are part of the codecs.
+        multiplexer_choices = [
+            (signal, set(signal.choices))
+            for signal in self._signals
+            if signal.is_multiplexer and signal.choices
+        ]
+        self._modified = False
+        self._refreshed = (tuple(self._signals), strict, multiplexer_choices)
+
+        for signal in self._signals:
+            signal._modified = False
+            signal._choice_numbers = None
+
+    def _is_modified(self, strict):
+        """Returns ``True`` if the message or any of its signals have been
+        modified by their property setters since last refreshed, if
+        signals have been added, removed or replaced, if multiplexer
+        choices have been modified, or if the message was not
+        refreshed with given `strict`.
+
+        """
+
+        if self._modified:
+            return True
+
+        signals, refreshed_strict, multiplexer_choices = self._refreshed
+
+        if len(self._signals) != len(signals):
+            return True
+
+        if strict and not refreshed_strict:
+            return True
+
+        for signal, refreshed_signal in zip(self._signals, signals):
+            if signal is not refreshed_signal or signal._modified:
+                return True
+
+        for signal, choices in multiplexer_choices:
+            if set(signal.choices or []) != choices:
+                return True
+
+        return False
+
+    def _reset_choice_numbers(self):
+        """Recreate the reverse choice lookup tables of all signals on next
+        use, as choices may have been modified in place.
+
+        """
+
+        for signal in self._signals:
+            signal._choice_numbers = None
 
     def __repr__(self):
         return "message('{}', 0x{:x}, {}, {}, {})".format(
@@ -870,3 +1742,61 @@ class Message(object):
             self._is_extended_frame,
             self._length,
             "'" + self._comment + "'" if self._comment is not None else None)
+
+
+class MessageView(object):
+    """A view of some signals of a message, created by
+    :meth:`Message.create_view()`.
+
+    """
+
+    __slots__ = ('_message', '_signals', '_signal_names', '_codec')
+
+    def __init__(self, message, signals, codec):
+        self._message = message
+        self._signals = signals
+        self._codec = codec
+
+        # Multiplexers needed to reach wanted signals are removed from
+        # the decoded signals.
+        if codec['multiplexers']:
+            self._signal_names = frozenset(signals)
+        else:
+            self._signal_names = None
+
+    @property
+    def message(self):
+        """The message of this view.
+
+        """
+
+        return self._message
+
+    @property
+    def signals(self):
+        """A list of the signal names in this view.
+
+        """
+
+        return self._signals
+
+    def decode(self, data, decode_choices=True, scaling=True, offset=0):
+        """Decode the signals in this view from given data. See
+        :meth:`Message.decode()` for a description of the arguments.
+
+        """
+
+        message = self._message
+        decoded = message._decode(self._codec,
+                                  message._get_data(data, offset),
+                                  decode_choices,
+                                  scaling)
+
+        if self._signal_names is not None:
+            decoded = {
+                name: value
+                for name, value in decoded.items()
+                if name in self._signal_names
+            }
+
+        return decoded
@@ -5,6 +5,8 @@ class Node(object):
 
     """
 
+    __slots__ = ('_name', '_comment', '_dbc')
+
     def __init__(self,
                  name,
                  comment,
@@ -1,5 +1,9 @@
 # A CAN signal.
 
+from ..utils import choice_string_to_number
+from ...compat import intern_string
+
+
 class Decimal(object):
     """Holds the same values as
     :attr:`~cantools.database.can.Signal.scale`,
@@ -11,6 +15,8 @@ class Decimal(object):
 
     """
 
+    __slots__ = ('_scale', '_offset', '_minimum', '_maximum')
+
     def __init__(self, scale=None, offset=None, minimum=None, maximum=None):
         self._scale = scale
         self._offset = offset
@@ -104,6 +110,15 @@ class Signal(object):
 
     """
 
+    # Slots instead of an instance dictionary, and interned byte
+    # orders, units and receivers, as large databases have tens of
+    # thousands of signals.
+    __slots__ = ('_name', '_start', '_length', '_byte_order', '_is_signed',
+                 '_scale', '_offset', '_minimum', '_maximum', '_decimal',
+                 '_unit', '_choices', '_choice_numbers', '_dbc', '_comment',
+                 '_receivers', '_is_multiplexer', '_multiplexer_ids',
+                 '_multiplexer_signal', '_is_float', '_modified')
+
     def __init__(self,
                  name,
                  start,
@@ -127,22 +142,30 @@ class Signal(object):
         self._name = name
         self._start = start
         self._length = length
-        self._byte_order = byte_order
+        self._byte_order = intern_string(byte_order)
         self._is_signed = is_signed
         self._scale = scale
         self._offset = offset
         self._minimum = minimum
         self._maximum = maximum
         self._decimal = Decimal() if decimal is None else decimal
-        self._unit = unit
+        self._unit = intern_string(unit)
         self._choices = choices
+        self._choice_numbers = None
         self._dbc = dbc_specifics
         self._comment = comment
-        self._receivers = [] if receivers is None else receivers
+
+        if receivers is None:
+            self._receivers = []
+        else:
+            self._receivers = [intern_string(receiver)
+                               for receiver in receivers]
+
         self._is_multiplexer = is_multiplexer
         self._multiplexer_ids = multiplexer_ids
         self._multiplexer_signal = multiplexer_signal
         self._is_float = is_float
+        self._modified = True
 
     @property
     def name(self):
@@ -155,6 +178,7 @@ class Signal(object):
     @name.setter
     def name(self, value):
         self._name = value
+        self._modified = True
 
     @property
     def start(self):
@@ -167,6 +191,7 @@ class Signal(object):
     @start.setter
     def start(self, value):
         self._start = value
+        self._modified = True
 
     @property
     def length(self):
@@ -179,6 +204,7 @@ class Signal(object):
     @length.setter
     def length(self, value):
         self._length = value
+        self._modified = True
 
     @property
     def byte_order(self):
@@ -190,7 +216,8 @@ class Signal(object):
 
     @byte_order.setter
     def byte_order(self, value):
-        self._byte_order = value
+        self._byte_order = intern_string(value)
+        self._modified = True
 
     @property
     def is_signed(self):
@@ -205,6 +232,7 @@ class Signal(object):
     @is_signed.setter
     def is_signed(self, value):
         self._is_signed = value
+        self._modified = True
 
     @property
     def is_float(self):
@@ -217,6 +245,7 @@ class Signal(object):
     @is_float.setter
     def is_float(self, value):
         self._is_float = value
+        self._modified = True
 
     @property
     def scale(self):
@@ -229,6 +258,7 @@ class Signal(object):
     @scale.setter
     def scale(self, value):
         self._scale = value
+        self._modified = True
 
     @property
     def offset(self):
@@ -241,6 +271,7 @@ class Signal(object):
     @offset.setter
     def offset(self, value):
         self._offset = value
+        self._modified = True
 
     @property
     def minimum(self):
@@ -253,6 +284,7 @@ class Signal(object):
     @minimum.setter
     def minimum(self, value):
         self._minimum = value
+        self._modified = True
 
     @property
     def maximum(self):
@@ -265,6 +297,7 @@ class Signal(object):
     @maximum.setter
     def maximum(self, value):
         self._maximum = value
+        self._modified = True
 
     @property
     def decimal(self):
@@ -291,7 +324,7 @@ class Signal(object):
 
     @unit.setter
     def unit(self, value):
-        self._unit = value
+        self._unit = intern_string(value)
 
     @property
     def choices(self):
@@ -342,6 +375,7 @@ class Signal(object):
     @is_multiplexer.setter
     def is_multiplexer(self, value):
         self._is_multiplexer = value
+        self._modified = True
 
     @property
     def multiplexer_ids(self):
@@ -355,6 +389,7 @@ class Signal(object):
     @multiplexer_ids.setter
     def multiplexer_ids(self, value):
         self._multiplexer_ids = value
+        self._modified = True
 
     @property
     def multiplexer_signal(self):
@@ -368,11 +403,23 @@ class Signal(object):
     @multiplexer_signal.setter
     def multiplexer_signal(self, value):
         self._multiplexer_signal = value
+        self._modified = True
 
     def choice_string_to_number(self, string):
-        for choice_number, choice_string in self.choices.items():
-            if choice_string == string:
-                return choice_number
+        """Returns the signal value of given choice string, or ``None`` if
+        not found. The reverse lookup table is created on first use,
+        and recreated when the message is refreshed, or if the choices
+        have been modified in place and given string is not found or
+        the number of choices has changed.
+
+        """
+
+        number, self._choice_numbers = choice_string_to_number(
+            self._choices,
+            self._choice_numbers,
+            string)
+
+        return number
 
     def __repr__(self):
 
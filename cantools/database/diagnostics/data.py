@@ -1,11 +1,19 @@
 # DID data.
 
+from ..utils import choice_string_to_number
+from ...compat import intern_string
+
+
 class Data(object):
     """A data data with position, size, unit and other information. A data
     is part of a DID.
 
     """
 
+    __slots__ = ('_name', '_start', '_length', '_byte_order', '_scale',
+                 '_offset', '_minimum', '_maximum', '_unit', '_choices',
+                 '_choice_numbers', 'is_float', 'is_signed')
+
     def __init__(self,
                  name,
                  start,
@@ -20,13 +28,14 @@ class Data(object):
         self._name = name
         self._start = start
         self._length = length
-        self._byte_order = byte_order
+        self._byte_order = intern_string(byte_order)
         self._scale = scale
         self._offset = offset
         self._minimum = minimum
         self._maximum = maximum
-        self._unit = unit
+        self._unit = intern_string(unit)
         self._choices = choices
+        self._choice_numbers = None
         # ToDo: Remove once types are handled properly.
         self.is_float = False
         self.is_signed = False
@@ -77,7 +86,7 @@ class Data(object):
 
     @byte_order.setter
     def byte_order(self, value):
-        self._byte_order = value
+        self._byte_order = intern_string(value)
 
     @property
     def scale(self):
@@ -137,7 +146,7 @@ class Data(object):
 
     @unit.setter
     def unit(self, value):
-        self._unit = value
+        self._unit = intern_string(value)
 
     @property
     def choices(self):
@@ -149,9 +158,20 @@ class Data(object):
         return self._choices
 
     def choice_string_to_number(self, string):
-        for choice_number, choice_string in self.choices.items():
-            if choice_string == string:
-                return choice_number
+        """Returns the data value of given choice string, or ``None`` if
+        not found. The reverse lookup table is created on first use,
+        and recreated when the DID is refreshed, or if the choices
+        have been modified in place and given string is not found or
+        the number of choices has changed.
+
+        """
+
+        number, self._choice_numbers = choice_string_to_number(
+            self._choices,
+            self._choice_numbers,
+            string)
+
+        return number
 
     def __repr__(self):
 
@@ -1,10 +1,11 @@
 # A DID.
 
-import binascii
-
 from ..utils import encode_data
 from ..utils import decode_data
+from ..utils import create_encode_fields
+from ..utils import create_decode_fields
 from ..utils import create_encode_decode_formats
+from ...compat import int_to_bytes
 
 
 class Did(object):
@@ -12,6 +13,9 @@ class Did(object):
 
     """
 
+    __slots__ = ('_identifier', '_name', '_length', '_datas',
+                 '_name_to_data', '_codec')
+
     def __init__(self,
                  identifier,
                  name,
@@ -21,6 +25,7 @@ class Did(object):
         self._name = name
         self._length = length
         self._datas = datas
+        self._name_to_data = {}
         self._codec = None
         self.refresh()
 
@@ -73,11 +78,7 @@ class Did(object):
         self._datas = value
 
     def get_data_by_name(self, name):
-        for data in self._datas:
-            if data.name == name:
-                return data
-
-        raise KeyError(name)
+        return self._name_to_data[name]
 
     def encode(self, data, scaling=True):
         """Encode given data as a DID of this type.
@@ -91,13 +92,11 @@ class Did(object):
         """
 
         encoded = encode_data(data,
-                              self._codec['datas'],
+                              self._codec['encode_fields'],
                               self._codec['formats'],
                               scaling)
-        encoded |= (0x80 << (8 * self._length))
-        encoded = hex(encoded)[4:].rstrip('L')
 
-        return binascii.unhexlify(encoded)[:self._length]
+        return int_to_bytes(encoded, self._length, 'big')
 
     def decode(self, data, decode_choices=True, scaling=True):
         """Decode given data as a DID of this type.
@@ -114,7 +113,7 @@ class Did(object):
         """
 
         return decode_data(data[:self._length],
-                           self._codec['datas'],
+                           self._codec['decode_fields'],
                            self._codec['formats'],
                            decode_choices,
                            scaling)
@@ -124,10 +123,18 @@ class Did(object):
 
         """
 
+        self._name_to_data = {}
+
+        for data in self._datas:
+            self._name_to_data.setdefault(data.name, data)
+            data._choice_numbers = None
+
+        formats = create_encode_decode_formats(self._datas, self._length)
         self._codec = {
             'datas': self._datas,
-            'formats': create_encode_decode_formats(self._datas,
-                                                    self._length)
+            'formats': formats,
+            'encode_fields': create_encode_fields(self._datas, formats),
+            'decode_fields': create_decode_fields(self._datas, formats)
         }
 
     def __repr__(self):
@@ -15,3 +15,10 @@ class EncodeError(Error):
 
 class DecodeError(Error):
     pass
+
+
+# Error codes returned by the try_decode methods instead of raising
+# exceptions.
+DECODE_ERROR_UNKNOWN_MESSAGE = 1
+DECODE_ERROR_DATA_TOO_SHORT = 2
+DECODE_ERROR_BAD_MULTIPLEXER_ID = 3
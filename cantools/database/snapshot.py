@@ -0,0 +1,103 @@
+# Binary database snapshots.
+
+import os
+import hashlib
+import pickle
+
+from .errors import Error
+from ..version import __version__
+
+
+MAGIC = b'cantools-snapshot\n'
+
+
+def _digest(filename):
+    sha1 = hashlib.sha1()
+
+    with open(filename, 'rb') as fin:
+        for chunk in iter(lambda: fin.read(1 << 16), b''):
+            sha1.update(chunk)
+
+    return sha1.hexdigest()
+
+
+def _key(filename):
+    """Returns the modification time, size and hash of given file.
+
+    """
+
+    stat = os.stat(filename)
+
+    return (stat.st_mtime, stat.st_size, _digest(filename))
+
+
+def _check_key(key, database_filename, filename):
+    if key is None:
+        raise Error(
+            "The snapshot '{}' was not saved with a database file.".format(
+                filename))
+
+    mtime, size, digest = key
+    stat = os.stat(database_filename)
+
+    # The hash is only calculated if the file may have been modified.
+    if stat.st_size == size:
+        if stat.st_mtime == mtime or _digest(database_filename) == digest:
+            return
+
+    raise Error(
+        "The snapshot '{}' is out of date with '{}'.".format(filename,
+                                                            database_filename))
+
+
+def save(database, filename, database_filename=None):
+    """Save given database `database` as a snapshot in given file
+    `filename`.
+
+    """
+
+    if database_filename is None:
+        key = None
+    else:
+        key = _key(database_filename)
+
+    # Write to a temporary file first, so no other process reads a
+    # partially written snapshot.
+    tmp_filename = '{}.{}.tmp'.format(filename, os.getpid())
+
+    with open(tmp_filename, 'wb') as fout:
+        fout.write(MAGIC)
+        pickle.dump((__version__, key), fout, pickle.HIGHEST_PROTOCOL)
+        pickle.dump(database, fout, pickle.HIGHEST_PROTOCOL)
+
+    try:
+        os.replace(tmp_filename, filename)
+    except AttributeError:
+        if os.path.exists(filename):
+            os.remove(filename)
+
+        os.rename(tmp_filename, filename)
+
+
+def load(filename, database_filename=None):
+    """Load a database from given snapshot file `filename`.
+
+    """
+
+    with open(filename, 'rb') as fin:
+        if fin.read(len(MAGIC)) != MAGIC:
+            raise Error(
+                "Expected a snapshot file, but got '{}'.".format(filename))
+
+        version, key = pickle.load(fin)
+
+        if version != __version__:
+            raise Error(
+                "Expected snapshot of cantools version {}, but got {}.".format(
+                    __version__,
+                    version))
+
+        if database_filename is not None:
+            _check_key(key, database_filename, filename)
+
+        return pickle.load(fin)
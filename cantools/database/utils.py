@@ -1,19 +1,85 @@
 # Utility functions.
 
-import binascii
+import math
+import struct
 from decimal import Decimal
 from collections import namedtuple
-import bitstruct
+
+from .errors import Error
+from .errors import EncodeError
+from .errors import DecodeError
+from ..compat import int_from_bytes
+from ..compat import int_to_bytes
 
 
 Formats = namedtuple('Formats',
                      [
-                         'big_endian',
-                         'little_endian',
-                         'padding_mask'
+                         'padding_mask',
+                         'layouts',
+                         'number_of_bytes',
+                         'number_of_bits'
                      ])
 
 
+# Position of a data in the message. `index` selects the message
+# interpreted as a big endian (0) or little endian (1) integer, and
+# the data value is `(value >> shift) & mask`.
+Layout = namedtuple('Layout',
+                    [
+                        'index',
+                        'shift',
+                        'mask',
+                        'sign_bit',
+                        'float_struct'
+                    ])
+
+
+class FloatStruct(struct.Struct):
+    """A picklable struct, as layouts are pickled with the database.
+
+    """
+
+    def __reduce__(self):
+        return (self.__class__, (self.format,))
+
+
+FLOAT_STRUCTS = {
+    32: FloatStruct('>f'),
+    64: FloatStruct('>d')
+}
+
+try:
+    FLOAT_STRUCTS[16] = FloatStruct('>e')
+except struct.error:
+    pass
+
+
+CacheInfo = namedtuple('CacheInfo',
+                       [
+                           'hits',
+                           'misses',
+                           'maxsize',
+                           'currsize'
+                       ])
+
+
+# Maximum number of layouts in the formats cache.
+FORMATS_CACHE_MAXSIZE = 4096
+
+# Formats shared by all messages and DIDs with the same layout.
+_formats_cache = {}
+_formats_cache_hits = 0
+_formats_cache_misses = 0
+
+
+# All integers in this range are exactly representable as floats.
+MAXIMUM_EXACT_INTEGER = 2 ** 52
+
+# Relative distance from a tie that floating point rounding errors
+# in scaling can not cross.
+ROUNDING_TOLERANCE = 2.0 ** -40
+
+
 def format_or(items):
     items = [str(item) for item in items]
 
@@ -24,6 +90,44 @@ def format_or(items):
                                  items[-1])
 
 
+def create_choice_numbers(choices):
+    """Returns a dictionary mapping choice strings of given choices to
+    their values. The first value wins if several values share a
+    string.
+
+    """
+
+    choice_numbers = {}
+
+    if choices is not None:
+        for choice_number, choice_string in choices.items():
+            choice_numbers.setdefault(choice_string, choice_number)
+
+    return choice_numbers
+
+
+def choice_string_to_number(choices, choice_numbers, string):
+    """Returns the value of given choice string in given choices, or
+    ``None`` if not found, and a reverse lookup table of the choices.
+
+    `choice_numbers` is the table returned by a previous call, or
+    ``None``. It is recreated if ``None``, if given string is not
+    found, or if the number of choices has changed, as the choices may
+    have been modified in place.
+
+    """
+
+    if choices is None:
+        return None, None
+
+    if (choice_numbers is None
+        or choice_numbers[0] != len(choices)
+        or string not in choice_numbers[1]):
+        choice_numbers = (len(choices), create_choice_numbers(choices))
+
+    return choice_numbers[1].get(string), choice_numbers
+
+
 def format_and(items):
     items = [str(item) for item in items]
 
@@ -41,150 +145,779 @@ def start_bit(data):
         return data.start
 
 
-def _encode_field(field, data, scaling):
-    value = data[field.name]
+def _scale_float(value, scale, offset):
+    return (value - offset) / scale
+
+
+def _scale_decimal(value, scale, offset):
+    value = (Decimal(value) - Decimal(offset)) / Decimal(scale)
+
+    return value.to_integral()
+
+
+def _scale_integer(value, scale, offset):
+    """Scale given value with integer scale and offset. Gives the same
+    result as :func:`_scale_decimal()`.
 
-    if isinstance(value, str):
-        return field.choice_string_to_number(value)
-    elif scaling:
-        if field.is_float:
-            return (value - field.offset) / field.scale
+    """
+
+    if type(value) is not int:
+        return _scale_real(value, scale, offset)
+
+    value -= offset
+
+    if scale == 1:
+        return value
+
+    # Round half to even, as Decimal.to_integral().
+    quotient, remainder = divmod(value, scale)
+    remainder = abs(2 * remainder)
+
+    if remainder > abs(scale) or (remainder == abs(scale) and quotient & 1):
+        quotient += 1
+
+    return quotient
+
+
+def _scale_real(value, scale, offset):
+    """Scale given value with scale and offset that are exact as floats
+    using floating point arithmetic. Falls back to
+    :func:`_scale_decimal()` if the result may be rounded differently.
+
+    """
+
+    value_type = type(value)
+
+    if (value_type is float
+        or (value_type is int
+            and -MAXIMUM_EXACT_INTEGER <= value <= MAXIMUM_EXACT_INTEGER)):
+        scaled = (value - offset) / scale
+
+        # Not true for NaN and infinity.
+        if -MAXIMUM_EXACT_INTEGER < scaled < MAXIMUM_EXACT_INTEGER:
+            integer = math.floor(scaled)
+            fraction = (scaled - integer)
+
+            # Far enough from a tie for floating point rounding errors
+            # not to matter.
+            if abs(fraction - 0.5) > ROUNDING_TOLERANCE * (1 + abs(scaled)):
+                return int(integer) + (fraction > 0.5)
+
+    return _scale_decimal(value, scale, offset)
+
+
+def _is_exact_float(value):
+    if type(value) is int:
+        return -MAXIMUM_EXACT_INTEGER <= value <= MAXIMUM_EXACT_INTEGER
+    elif type(value) is float:
+        return not (math.isinf(value) or math.isnan(value))
+    else:
+        return False
+
+
+def get_scale_function(field):
+    """Returns the function used to scale values of given field when
+    encoding. Integer fields are scaled without Decimal when the result
+    is known to be the same.
+
+    """
+
+    scale = field.scale
+    offset = field.offset
+
+    if field.is_float:
+        return _scale_float
+    elif scale == 0 or not (_is_exact_float(scale) and _is_exact_float(offset)):
+        return _scale_decimal
+    elif type(scale) is int and type(offset) is int:
+        return _scale_integer
+    else:
+        return _scale_real
+
+
+def _encode_shift(layout, formats):
+    """Big endian values are shifted into an integer of `number_of_bits`
+    bits, as signals may not fit in the message if not strict.
+
+    """
+
+    if layout.index == 0:
+        return (layout.shift
+                + formats.number_of_bits
+                - 8 * formats.number_of_bytes)
+    else:
+        return layout.shift
+
+
+def create_encode_fields(fields, formats):
+    """Returns a tuple of everything needed to encode given fields, in
+    the order expected by :func:`encode_data()`.
+
+    """
+
+    encode_fields = []
+
+    for field, layout in zip(fields, formats.layouts):
+        if layout.float_struct is not None:
+            minimum = None
+            maximum = None
+            fmt = 'f{}'.format(field.length)
+        elif layout.sign_bit:
+            minimum = -layout.sign_bit
+            maximum = (layout.sign_bit - 1)
+            fmt = 's{}'.format(field.length)
         else:
-            value = (Decimal(value) - Decimal(field.offset)) / Decimal(field.scale)
+            minimum = 0
+            maximum = layout.mask
+            fmt = 'u{}'.format(field.length)
+
+        encode_fields.append((field.name,
+                              field,
+                              get_scale_function(field),
+                              field.scale,
+                              field.offset,
+                              layout.index,
+                              _encode_shift(layout, formats),
+                              layout.mask,
+                              minimum,
+                              maximum,
+                              layout.float_struct,
+                              fmt))
+
+    return tuple(encode_fields)
+
+
+def _join(big, little, formats):
+    """Join given big and little endian integers into one integer with
+    the same byte order as the message.
+
+    """
+
+    number_of_bytes = formats.number_of_bytes
+    big >>= (formats.number_of_bits - 8 * number_of_bytes)
+
+    if little:
+        little &= ((1 << (8 * number_of_bytes)) - 1)
+        big |= int_from_bytes(int_to_bytes(little, number_of_bytes, 'little'),
+                              'big')
+
+    return big
+
+
+def encode_data(data, encode_fields, formats, scaling):
+    values = [0, 0]
+
+    for (name,
+         field,
+         scale_value,
+         scale,
+         offset,
+         index,
+         shift,
+         mask,
+         minimum,
+         maximum,
+         float_struct,
+         fmt) in encode_fields:
+        value = data[name]
+
+        if isinstance(value, str):
+            choice_string = value
+            value = field.choice_string_to_number(choice_string)
+
+            if value is None:
+                raise EncodeError(
+                    "Expected a choice string of '{}', but got '{}'.".format(
+                        name,
+                        choice_string))
+        elif scaling:
+            value = scale_value(value, scale, offset)
+
+        if float_struct is None:
+            value = int(value)
+
+            if not minimum <= value <= maximum:
+                raise EncodeError(
+                    '"{}" requires {} <= integer <= {} (got {})'.format(
+                        fmt,
+                        minimum,
+                        maximum,
+                        value))
+
+            value &= mask
+        else:
+            value = int_from_bytes(float_struct.pack(value), 'big')
+
+        values[index] |= (value << shift)
+
+    return _join(values[0], values[1], formats)
+
+
+def create_decode_fields(fields, formats):
+    """Returns a tuple of everything needed to decode given fields, in
+    the order expected by :func:`decode_data()`.
+
+    """
+
+    return tuple([
+        (field.name,) + tuple(layout) + (field.scale,
+                                         field.offset,
+                                         field.choices)
+        for field, layout in zip(fields, formats.layouts)
+    ])
+
+
+def decode_data(data,
+                decode_fields,
+                formats,
+                decode_choices,
+                scaling,
+                decoded=None):
+    """Decode given data. Returns a dictionary of field names and values,
+    or given `decoded`, where each value is stored at the name of its
+    field. The names are row positions if `decoded` is a list.
+
+    """
+
+    if 8 * len(data) < formats.number_of_bits:
+        raise DecodeError(
+            'unpack requires at least {} bits to unpack (got {})'.format(
+                formats.number_of_bits,
+                8 * len(data)))
+
+    values = (int_from_bytes(data, 'big'), int_from_bytes(data, 'little'))
+
+    if decoded is None:
+        decoded = {}
+
+    for (name,
+         index,
+         shift,
+         mask,
+         sign_bit,
+         float_struct,
+         scale,
+         offset,
+         choices) in decode_fields:
+        value = ((values[index] >> shift) & mask)
+
+        if sign_bit:
+            if value & sign_bit:
+                value -= (sign_bit << 1)
+        elif float_struct is not None:
+            value = float_struct.unpack(
+                int_to_bytes(value, float_struct.size, 'big'))[0]
+
+        if decode_choices and choices:
+            try:
+                decoded[name] = choices[value]
+                continue
+            except KeyError:
+                pass
+
+        if scaling:
+            value = (scale * value + offset)
+
+        decoded[name] = value
+
+    return decoded
+
+
+def decode_data_columns(datas, decode_fields, formats, decode_choices, scaling):
+    """Decode given list of datas. Returns a dictionary of field names and
+    lists of values, one value per data.
+
+    """
+
+    if datas:
+        minimum_length = min([len(data) for data in datas])
 
-            return value.to_integral()
+        if 8 * minimum_length < formats.number_of_bits:
+            raise DecodeError(
+                'unpack requires at least {} bits to unpack (got {})'.format(
+                    formats.number_of_bits,
+                    8 * minimum_length))
+
+    values = [None, None]
+    decoded = {}
+
+    for (name,
+         index,
+         shift,
+         mask,
+         sign_bit,
+         float_struct,
+         scale,
+         offset,
+         choices) in decode_fields:
+        if values[index] is None:
+            byteorder = ('big', 'little')[index]
+            values[index] = [int_from_bytes(data, byteorder) for data in datas]
+
+        if not (sign_bit
+                or float_struct is not None
+                or (decode_choices and choices)):
+            if scaling:
+                decoded[name] = [
+                    scale * ((value >> shift) & mask) + offset
+                    for value in values[index]
+                ]
+            else:
+                decoded[name] = [
+                    ((value >> shift) & mask) for value in values[index]
+                ]
+
+            continue
+
+        column = [((value >> shift) & mask) for value in values[index]]
+
+        if sign_bit:
+            column = [value - ((value & sign_bit) << 1) for value in column]
+        elif float_struct is not None:
+            size = float_struct.size
+            column = [
+                float_struct.unpack(int_to_bytes(value, size, 'big'))[0]
+                for value in column
+            ]
+
+        if decode_choices and choices:
+            if scaling:
+                column = [
+                    choices[value] if value in choices else scale * value + offset
+                    for value in column
+                ]
+            else:
+                column = [
+                    choices[value] if value in choices else value
+                    for value in column
+                ]
+        elif scaling:
+            column = [scale * value + offset for value in column]
+
+        decoded[name] = column
+
+    return decoded
+
+
+def _decode_array_field(payloads, index, shift, length, number_of_bits):
+    """Returns the raw values of given field as an unsigned 64 bits
+    NumPy array.
+
+    """
+
+    import numpy
+
+    if index == 1:
+        payloads = payloads[:, ::-1]
+
+    begin = (number_of_bits - shift - length)
+    end = (number_of_bits - shift)
+    first = (begin // 8)
+    last = ((end - 1) // 8)
+    trailing = numpy.uint64(8 * (last + 1) - end)
+    column = payloads[:, first].astype(numpy.uint64)
+
+    if first == last:
+        return (column >> trailing) & numpy.uint64((1 << length) - 1)
+
+    column &= numpy.uint64(0xff >> (begin % 8))
+
+    for i in range(first + 1, last):
+        column <<= numpy.uint64(8)
+        column |= payloads[:, i]
+
+    column <<= (numpy.uint64(8) - trailing)
+    column |= (payloads[:, last].astype(numpy.uint64) >> trailing)
+
+    return column
+
+
+def _integer_array_dtype(values):
+    """Returns the smallest of int64, uint64 and object NumPy dtypes that
+    can hold all given integer values.
+
+    """
+
+    import numpy
+
+    minimum = min(values)
+    maximum = max(values)
+
+    if minimum >= -(1 << 63) and maximum < (1 << 63):
+        return numpy.int64
+    elif minimum >= 0 and maximum < (1 << 64):
+        return numpy.uint64
     else:
-        return value
+        return object
+
+
+def _scale_integer_array(value, length, sign_bit, scale, offset):
+    """Scale given NumPy array of raw integer values of a field of given
+    length with integer scale and offset. The values are widened to
+    an object array if the scaled values do not fit in 64 bits.
 
+    """
 
-def _decode_field(field, value, decode_choices, scaling):
-    if decode_choices:
-        try:
-            return field.choices[value]
-        except (KeyError, TypeError):
-            pass
+    import numpy
 
-    if scaling:
-        return (field.scale * value + field.offset)
+    if sign_bit:
+        raw = [-(1 << (length - 1)), (1 << (length - 1)) - 1]
     else:
+        raw = [0, (1 << length) - 1]
+
+    scaled = [raw_value * scale for raw_value in raw]
+    dtype = _integer_array_dtype(raw
+                                 + scaled
+                                 + [value + offset for value in scaled])
+
+    if dtype is object:
+        return (value.astype(object) * scale + offset)
+    else:
+        value = value.astype(dtype)
+
+        return (value * dtype(scale) + dtype(offset))
+
+
+def decode_data_array(payloads, decode_fields, formats, scaling):
+    """Decode given two dimensional NumPy array of payloads, one row per
+    data. Returns a dictionary of field names and NumPy arrays.
+
+    """
+
+    import numpy
+
+    number_of_bits = (8 * payloads.shape[1])
+
+    if number_of_bits < formats.number_of_bits:
+        raise DecodeError(
+            'unpack requires at least {} bits to unpack (got {})'.format(
+                formats.number_of_bits,
+                number_of_bits))
+
+    decoded = {}
+
+    for (name,
+         index,
+         shift,
+         mask,
+         sign_bit,
+         float_struct,
+         scale,
+         offset,
+         _) in decode_fields:
+        length = mask.bit_length()
+
+        if length > 64:
+            raise DecodeError(
+                'Expected a length of at most 64 bits in NumPy arrays, but '
+                'got {} bits.'.format(length))
+
+        value = _decode_array_field(payloads,
+                                    index,
+                                    shift,
+                                    length,
+                                    number_of_bits)
+
+        if sign_bit:
+            unused = numpy.uint64(64 - length)
+            value = (value << unused).view(numpy.int64) >> numpy.int64(unused)
+        elif float_struct is not None:
+            value = value.astype('u{}'.format(length // 8))
+            value = value.view('f{}'.format(length // 8))
+
+            with numpy.errstate(invalid='ignore'):
+                value = value.astype(numpy.float64)
+        elif length < 64:
+            value = value.astype(numpy.int64)
+
+        if scaling and not (scale == 1 and offset == 0):
+            if (float_struct is None
+                and type(scale) is int
+                and type(offset) is int):
+                value = _scale_integer_array(value,
+                                             length,
+                                             sign_bit,
+                                             scale,
+                                             offset)
+            else:
+                value = (value * float(scale) + float(offset))
+
+        decoded[name] = value
+
+    return decoded
+
+
+def _encode_array_field(encoded, value, index, shift, length):
+    """Insert given unsigned 64 bits NumPy array of field values into
+    given two dimensional NumPy array of payloads.
+
+    """
+
+    import numpy
+
+    if index == 1:
+        encoded = encoded[:, ::-1]
+
+    number_of_bytes = encoded.shape[1]
+    end = (8 * number_of_bytes - shift)
+    first = ((end - length) // 8)
+    last = ((end - 1) // 8)
+
+    for i in range(max(first, 0), min(last + 1, number_of_bytes)):
+        byte_shift = (end - 8 * i - 8)
+
+        if byte_shift >= 0:
+            byte = (value >> numpy.uint64(byte_shift))
+        else:
+            byte = (value << numpy.uint64(-byte_shift))
+
+        encoded[:, i] |= (byte & numpy.uint64(0xff)).astype(numpy.uint8)
+
+
+def _unscale_integer_array(value, scale, offset):
+    """Scale given NumPy array of integer values with integer scale and
+    offset using integer arithmetic. Gives the same result as
+    :func:`_scale_integer()`.
+
+    """
+
+    import numpy
+
+    if len(value) == 0:
         return value
 
+    minimum = int(value.min())
+    maximum = int(value.max())
+    dtype = _integer_array_dtype([minimum,
+                                  maximum,
+                                  minimum - offset,
+                                  maximum - offset,
+                                  2 * scale,
+                                  -2 * scale])
+
+    if dtype is numpy.int64:
+        scale = numpy.int64(scale)
+        offset = numpy.int64(offset)
+    else:
+        dtype = object
 
-def encode_data(data, fields, formats, scaling):
-    unpacked = {
-        field.name: _encode_field(field, data, scaling)
-        for field in fields
-    }
-    big_packed = formats.big_endian.pack(unpacked)
-    little_packed = formats.little_endian.pack(unpacked)[::-1]
-    packed_union = int(binascii.hexlify(big_packed), 16)
-    packed_union |= int(binascii.hexlify(little_packed), 16)
+    value = (value.astype(dtype) - offset)
 
-    return packed_union
+    if scale == 1:
+        return value
 
+    # Round half to even, as Decimal.to_integral().
+    quotient, remainder = numpy.divmod(value, scale)
+    remainder = numpy.abs(2 * remainder)
+    scale = abs(scale)
+    quotient += ((remainder > scale)
+                 | ((remainder == scale) & ((quotient & 1) == 1)))
+
+    return quotient
+
+
+def encode_data_array(data, number_of_datas, encode_fields, formats, scaling):
+    """Encode given dictionary of field names and NumPy arrays, with
+    `number_of_datas` values each. Returns a two dimensional NumPy
+    array of payloads, one row per data.
+
+    """
+
+    import numpy
+
+    encoded = numpy.zeros((number_of_datas, formats.number_of_bytes),
+                          dtype=numpy.uint8)
+
+    for encode_field, layout in zip(encode_fields, formats.layouts):
+        (name,
+         field,
+         _,
+         scale,
+         offset,
+         _,
+         _,
+         mask,
+         minimum,
+         maximum,
+         float_struct,
+         fmt) = encode_field
+
+        if field.length > 64:
+            raise EncodeError(
+                'Expected a length of at most 64 bits in NumPy arrays, but '
+                'got {} bits.'.format(field.length))
+
+        value = data[name]
+
+        if scaling and not (scale == 1 and offset == 0):
+            if (float_struct is None
+                and value.dtype.kind in 'iu'
+                and type(scale) is int
+                and type(offset) is int):
+                value = _unscale_integer_array(value, scale, offset)
+            else:
+                value = ((value - offset) / scale)
+
+        if float_struct is None:
+            if value.dtype.kind == 'f':
+                if scaling:
+                    value = numpy.rint(value)
+                else:
+                    value = numpy.trunc(value)
+
+            invalid = ((value < minimum) | (value > maximum))
+
+            if invalid.any():
+                raise EncodeError(
+                    '"{}" requires {} <= integer <= {} (got {})'.format(
+                        fmt,
+                        minimum,
+                        maximum,
+                        int(value[numpy.argmax(invalid)])))
+
+            if minimum < 0:
+                value = value.astype(numpy.int64)
+
+            value = (value.astype(numpy.uint64) & numpy.uint64(mask))
+        else:
+            size = float_struct.size
+            value = value.astype('f{}'.format(size))
+            value = value.view('u{}'.format(size)).astype(numpy.uint64)
 
-def decode_data(data, fields, formats, decode_choices, scaling):
-    unpacked = formats.big_endian.unpack(data)
-    unpacked.update(formats.little_endian.unpack(data[::-1]))
+        _encode_array_field(encoded,
+                            value,
+                            layout.index,
+                            layout.shift,
+                            field.length)
 
-    return {
-        field.name: _decode_field(field,
-                                  unpacked[field.name],
-                                  decode_choices,
-                                  scaling)
-        for field in fields
-    }
+    return encoded
 
 
-def create_encode_decode_formats(datas, number_of_bytes):
+def create_layouts(datas, number_of_bytes):
+    """Returns the layout of each data and the number of bits needed to
+    decode all of them.
+
+    """
+
     format_length = (8 * number_of_bytes)
+    number_of_bits = format_length
+    layouts = []
+
+    for data in datas:
+        if data.byte_order == 'big_endian':
+            end = (start_bit(data) + data.length)
+            index = 0
+            shift = (format_length - end)
+        else:
+            end = (data.start + data.length)
+            index = 1
+            shift = data.start
+
+        number_of_bits = max(number_of_bits, end)
 
-    def get_format_string_type(data):
         if data.is_float:
-            return 'f'
-        elif data.is_signed:
-            return 's'
+            sign_bit = 0
+
+            try:
+                float_struct = FLOAT_STRUCTS[data.length]
+            except KeyError:
+                raise Error(
+                    'Expected float size of {}, but got {} bits.'.format(
+                        format_or(sorted(FLOAT_STRUCTS)),
+                        data.length))
         else:
-            return 'u'
+            sign_bit = (1 << (data.length - 1)) if data.is_signed else 0
+            float_struct = None
 
-    def padding_item(length):
-        fmt = 'p{}'.format(length)
-        padding_mask = '1' * length
+        layouts.append(Layout(index,
+                              shift,
+                              (1 << data.length) - 1,
+                              sign_bit,
+                              float_struct))
 
-        return fmt, padding_mask, None
+    return tuple(layouts), number_of_bits
 
-    def data_item(data):
-        fmt = '{}{}'.format(get_format_string_type(data),
-                            data.length)
-        padding_mask = '0' * data.length
 
-        return fmt, padding_mask, data.name
+def _create_encode_decode_formats(datas, number_of_bytes):
+    layouts, number_of_bits = create_layouts(datas, number_of_bytes)
+    formats = Formats(0, layouts, number_of_bytes, number_of_bits)
+    used = [0, 0]
 
-    def fmt(items):
-        return ''.join([item[0] for item in items])
+    for layout in layouts:
+        used[layout.index] |= (layout.mask << _encode_shift(layout, formats))
 
-    def names(items):
-        return [item[2] for item in items if item[2] is not None]
+    padding_mask = ((1 << (8 * number_of_bytes)) - 1)
+    padding_mask &= ~_join(used[0], used[1], formats)
 
-    def padding_mask(items):
-        try:
-            return int(''.join([item[1] for item in items]), 2)
-        except ValueError:
-            return 0
+    return formats._replace(padding_mask=padding_mask)
 
-    def create_big():
-        items = [('>', '', None)]
-        start = 0
 
-        for data in datas:
-            if data.byte_order == 'little_endian':
-                continue
+def create_encode_masks(formats):
+    """Returns a tuple of the bits used by each layout of given formats
+    in encoded data, as returned by :func:`encode_data()`.
 
-            padding_length = (start_bit(data) - start)
+    """
 
-            if padding_length > 0:
-                items.append(padding_item(padding_length))
+    masks = []
 
-            items.append(data_item(data))
-            start = (start_bit(data) + data.length)
+    for layout in formats.layouts:
+        used = [0, 0]
+        used[layout.index] = (layout.mask << _encode_shift(layout, formats))
+        masks.append(_join(used[0], used[1], formats))
 
-        if start < format_length:
-            length = format_length - start
-            items.append(padding_item(length))
+    return tuple(masks)
 
-        return fmt(items), padding_mask(items), names(items)
 
-    def create_little():
-        items = [('>', '', None)]
-        end = format_length
+def create_encode_decode_formats(datas, number_of_bytes):
+    """Returns the formats of given datas in a message of given
+    length. Formats are cached by layout and shared, as many messages
+    often have the same layout.
 
-        for data in datas[::-1]:
-            if data.byte_order == 'big_endian':
-                continue
+    """
+
+    global _formats_cache_hits
+    global _formats_cache_misses
+
+    key = (number_of_bytes, tuple([
+        (data.start, data.length, data.byte_order, data.is_signed, data.is_float)
+        for data in datas
+    ]))
+
+    try:
+        formats = _formats_cache[key]
+        _formats_cache_hits += 1
+    except KeyError:
+        formats = _create_encode_decode_formats(datas, number_of_bytes)
+        _formats_cache_misses += 1
+
+        if len(_formats_cache) >= FORMATS_CACHE_MAXSIZE:
+            _formats_cache.clear()
+
+        _formats_cache[key] = formats
+
+    return formats
 
-            padding_length = end - (data.start + data.length)
 
-            if padding_length > 0:
-                items.append(padding_item(padding_length))
+def formats_cache_info():
+    """Returns a named tuple of hits, misses, maximum size and current
+    size of the process wide formats cache.
 
-            items.append(data_item(data))
-            end = data.start
+    """
 
-        if end > 0:
-            items.append(padding_item(end))
+    return CacheInfo(_formats_cache_hits,
+                     _formats_cache_misses,
+                     FORMATS_CACHE_MAXSIZE,
+                     len(_formats_cache))
 
-        value = padding_mask(items)
 
-        if format_length > 0:
-            length = len(''.join([item[1] for item in items]))
-            value = bitstruct.pack('u{}'.format(length), value)
-            value = int(binascii.hexlify(value[::-1]), 16)
+def formats_cache_clear():
+    """Clear the formats cache and its statistics.
 
-        return fmt(items), value, names(items)
+    """
 
-    big_fmt, big_padding_mask, big_names = create_big()
-    little_fmt, little_padding_mask, little_names = create_little()
+    global _formats_cache_hits
+    global _formats_cache_misses
 
-    return Formats(bitstruct.compile(big_fmt, big_names),
-                   bitstruct.compile(little_fmt, little_names),
-                   big_padding_mask & little_padding_mask)
+    _formats_cache.clear()
+    _formats_cache_hits = 0
+    _formats_cache_misses = 0
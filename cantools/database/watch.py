@@ -0,0 +1,223 @@
+# Databases reloaded when their file is modified.
+
+import os
+import logging
+import threading
+
+from .can import Database
+from .can.internal_database import LazyMessage
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _dbc_key(dbc):
+    if dbc is None or dbc.attributes is None:
+        return None
+
+    return {
+        name: attribute.value
+        for name, attribute in dbc.attributes.items()
+    }
+
+
+def _signal_key(signal):
+    decimal = signal.decimal
+
+    return (signal.name,
+            signal.start,
+            signal.length,
+            signal.byte_order,
+            signal.is_signed,
+            signal.is_float,
+            signal.scale,
+            signal.offset,
+            signal.minimum,
+            signal.maximum,
+            decimal.scale,
+            decimal.offset,
+            decimal.minimum,
+            decimal.maximum,
+            signal.unit,
+            signal.choices,
+            signal.comment,
+            signal.receivers,
+            signal.is_multiplexer,
+            signal.multiplexer_ids,
+            signal.multiplexer_signal,
+            _dbc_key(signal.dbc))
+
+
+def _message_key(message):
+    """Returns a key of given message, which is equal for messages with
+    equal definitions, but not hashable. The key of a lazy message is
+    the key of its parsed definition, so it is not loaded.
+
+    """
+
+    if isinstance(message, LazyMessage):
+        return message.definition
+
+    return (message.frame_id,
+            message.is_extended_frame,
+            message.name,
+            message.length,
+            message.senders,
+            message.send_type,
+            message.cycle_time,
+            message.comment,
+            message.bus_name,
+            message.protocol,
+            _dbc_key(message.dbc),
+            [_signal_key(signal) for signal in message.signals])
+
+
+class WatchedDatabase(object):
+    """A CAN database loaded from given file `filename`, which is reloaded
+    by a background thread when modified.
+
+    The modification time and size of the file are polled every
+    `interval` seconds. The reloaded database replaces the current
+    database in one assignment, so calls in progress use either the
+    current or the reloaded database, never a partially reloaded
+    one. Messages unchanged in the reloaded file are not replaced, and
+    keep their codecs. Only DBC files are compared before their
+    messages are loaded, so only modified DBC messages are loaded
+    when reloaded. Errors when reloading are logged, and the current
+    database is kept until the file is modified again.
+
+    Attributes and methods of the current
+    :class:`can.Database<.can.Database>` are available on this
+    object.
+
+    See :func:`~cantools.database.load_file()` for descriptions of
+    other arguments.
+
+    >>> db = cantools.database.WatchedDatabase('foo.dbc')
+    >>> db.decode_message(158, b'\\x01\\x45\\x23\\x00\\x11')
+    {'Bar': 1, 'Fum': 5.0}
+    >>> db.stop()
+
+    """
+
+    def __init__(self,
+                 filename,
+                 database_format=None,
+                 encoding=None,
+                 frame_id_mask=None,
+                 strict=True,
+                 interval=1.0):
+        self._database = None
+        self._filename = filename
+        self._database_format = database_format
+        self._encoding = encoding
+        self._frame_id_mask = frame_id_mask
+        self._strict = strict
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._messages = {}
+        self._key = self._stat()
+        self._database = self._load()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    @property
+    def database(self):
+        """The current database.
+
+        """
+
+        return self._database
+
+    def reload(self):
+        """Reload the database file if modified since last loaded. Returns
+        ``True`` if reloaded, ``False`` otherwise. Called by the
+        background thread, but may be called directly to reload
+        without waiting for it.
+
+        """
+
+        with self._lock:
+            key = self._stat()
+
+            if key == self._key:
+                return False
+
+            # Do not reload a bad file again until modified.
+            self._key = key
+            self._database = self._load()
+
+        return True
+
+    def stop(self):
+        """Stop the background thread.
+
+        """
+
+        self._stop_event.set()
+        self._thread.join()
+
+    def _stat(self):
+        stat = os.stat(self._filename)
+
+        return (stat.st_mtime, stat.st_size)
+
+    def _load(self):
+        """Load the database file, replacing messages with unchanged
+        definitions by current messages before any message is loaded.
+
+        """
+
+        # The package imports this module.
+        from . import _parse_can_file
+        from . import _load_can_file_definitions
+
+        database_format, definitions = _parse_can_file(self._filename,
+                                                       self._database_format,
+                                                       self._encoding)
+        database = _load_can_file_definitions(database_format,
+                                              definitions,
+                                              self._strict,
+                                              True)
+        messages = database.messages
+        keys = []
+
+        for index, message in enumerate(messages):
+            key = _message_key(message)
+            keys.append(key)
+            current_message = self._messages.get((message.frame_id,
+                                                  message.name))
+
+            if current_message is not None and current_message[0] == key:
+                messages[index] = current_message[1]
+
+        database = Database(messages,
+                            database.nodes,
+                            database.buses,
+                            database.version,
+                            database.dbc,
+                            frame_id_mask=self._frame_id_mask,
+                            strict=self._strict)
+
+        # Load modified messages now to raise any errors.
+        self._messages = {
+            (message.frame_id, message.name): (key, message)
+            for key, message in zip(keys, database.messages)
+        }
+
+        return database
+
+    def _run(self):
+        while not self._stop_event.wait(self._interval):
+            try:
+                self.reload()
+            except Exception as e:
+                LOGGER.warning("Failed to reload '%s': %s", self._filename, e)
+
+    def __getattr__(self, name):
+        return getattr(self._database, name)
+
+    def __repr__(self):
+        return "watched_database('{}')".format(self._filename)
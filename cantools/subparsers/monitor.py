@@ -212,9 +212,9 @@ class Monitor(can.Listener):
         timestamp -= self._basetime
         self._received += 1
 
-        try:
-            message = self._dbase.get_message_by_frame_id(frame_id)
-        except KeyError:
+        message = self._dbase.try_get_message_by_frame_id(frame_id)
+
+        if message is None:
             self._discarded += 1
             return
 
@@ -47,19 +47,24 @@ def format_message_by_frame_id(dbase,
                                data,
                                decode_choices,
                                single_line):
-    try:
-        message = dbase.get_message_by_frame_id(frame_id)
-    except KeyError:
+    message = dbase.try_get_message_by_frame_id(frame_id)
+
+    if message is None:
         return ' Unknown frame id {0} (0x{0:x})'.format(frame_id)
 
     return format_message(message, data, decode_choices, single_line)
 
 
 def format_message(message, data, decode_choices, single_line):
-    try:
-        decoded_signals = message.decode(data, decode_choices)
-    except Exception as e:
-        return ' ' + str(e)
+    decoded_signals, error = message.try_decode(data, decode_choices)
+
+    if error is not None:
+        # Only an error code is returned, so decode again to get an
+        # exception describing the error.
+        try:
+            message.decode(data, decode_choices)
+        except Exception as e:
+            return ' ' + str(e)
 
     formatted_signals = _format_signals(message, decoded_signals)
 
@@ -45,10 +45,10 @@ class Listener(can.Listener):
         if msg.is_error_frame or msg.is_remote_frame:
             return
 
-        try:
-            database_message = self._database.get_message_by_frame_id(
-                msg.arbitration_id)
-        except KeyError:
+        database_message = self._database.try_get_message_by_frame_id(
+            msg.arbitration_id)
+
+        if database_message is None:
             return
 
         if database_message.name not in self._messages:
@@ -59,10 +59,16 @@ class Listener(can.Listener):
         if not message.enabled:
             return
 
-        decoded = DecodedMessage(database_message.name,
-                                 database_message.decode(msg.data,
-                                                         message.decode_choices,
-                                                         message.scaling))
+        decoded_signals, error = database_message.try_decode(
+            msg.data,
+            message.decode_choices,
+            message.scaling)
+
+        # Malformed frames are ignored.
+        if error is not None:
+            return
+
+        decoded = DecodedMessage(database_message.name, decoded_signals)
 
         if self._on_message:
             self._on_message(decoded)
@@ -91,6 +97,11 @@ class Message(UserDict, object):
         self.enabled = True
         self._can_message = None
         self._periodic_task = None
+        self._multiplexers = set([
+            signal.name
+            for signal in database.signals
+            if signal.is_multiplexer
+        ])
         self.update({signal.name: 0 for signal in database.signals})
 
     @property
@@ -102,11 +113,11 @@ class Message(UserDict, object):
 
     def __setitem__(self, signal_name, value):
         self.data[signal_name] = value
-        self._update_can_message()
+        self._update_can_message({signal_name: value})
 
     def update(self, signals):
         self.data.update(signals)
-        self._update_can_message()
+        self._update_can_message(signals)
 
     def send(self, signals=None):
         if signals is not None:
@@ -193,12 +204,21 @@ class Message(UserDict, object):
             self._periodic_task.stop()
             self._periodic_task = None
 
-    def _update_can_message(self):
+    def _update_can_message(self, signals):
         arbitration_id = self.database.frame_id
         extended_id = self.database.is_extended_frame
-        data = self.database.encode(self.data,
-                                    self.scaling,
-                                    self.padding)
+
+        # Only encode changed signals if the multiplexed parts of the
+        # message are unchanged.
+        if (self._can_message is None
+            or self._multiplexers.intersection(signals)):
+            data = self.database.encode(self.data,
+                                        self.scaling,
+                                        self.padding)
+        else:
+            data = self.database.encode_update(self._can_message.data,
+                                               signals,
+                                               self.scaling)
         self._can_message = can.Message(arbitration_id=arbitration_id,
                                         extended_id=extended_id,
                                         data=data)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+#
+# Compare the time to parse a generated DBC file with the plain
+# grammar parser and with message and signal definitions scanned by
+# regular expressions.
+#
+# > python3 dbc_parse.py
+# Parsing 500 messages with 16 signals each.
+# Parser:  0.62 s
+# Scanner: 0.08 s (7.6 times faster)
+#
+
+from __future__ import print_function
+import timeit
+from cantools.database.can.formats import dbc
+
+
+NUMBER_OF_MESSAGES = 500
+NUMBER_OF_SIGNALS = 16
+REPEAT = 3
+
+
+def create_string():
+    lines = ['VERSION ""', 'NS_ :', 'BS_:', 'BU_: ECU1 ECU2']
+
+    for i in range(NUMBER_OF_MESSAGES):
+        lines.append('BO_ {} M{}: 8 ECU1'.format(i + 1, i))
+
+        for j in range(NUMBER_OF_SIGNALS):
+            lines.append(
+                ' SG_ S{}_{} : {}|4@0- (0.1,-4.0E1) [-40|-38.5] '
+                '"degC" ECU2,ECU1'.format(i, j, 8 * (j // 2) + 7 - 4 * (j % 2)))
+
+    lines.append('CM_ BO_ 1 "A comment.";')
+
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    string = create_string()
+
+    if dbc._parse(string) != dbc.Parser().parse(string):
+        raise Exception('The scanner and the parser differ.')
+
+    print('Parsing {} messages with {} signals each.'.format(
+        NUMBER_OF_MESSAGES,
+        NUMBER_OF_SIGNALS))
+
+    parser_time = min(timeit.repeat(lambda: dbc.Parser().parse(string),
+                                    number=1,
+                                    repeat=REPEAT))
+    scanner_time = min(timeit.repeat(lambda: dbc._parse(string),
+                                     number=1,
+                                     repeat=REPEAT))
+
+    print('Parser:  {:.2f} s'.format(parser_time))
+    print('Scanner: {:.2f} s ({:.1f} times faster)'.format(
+        scanner_time,
+        parser_time / scanner_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -32,6 +32,9 @@ setup(name='cantools',
           'textparser',
           'diskcache'
       ],
+      extras_require={
+          'numpy': ['numpy']
+      },
       test_suite="tests",
       entry_points = {
           'console_scripts': ['cantools=cantools.__init__:_main']
@@ -77,6 +77,28 @@ IO_DEBUG(
                     actual_output = stdout.getvalue()
                     self.assertEqual(actual_output, expected_output)
 
+    def test_decode_error(self):
+        """Test formatting messages that can not be decoded.
+
+        """
+
+        db = cantools.database.load_file('tests/files/multiplex_choices.dbc')
+        message = db.get_message_by_name('Message1')
+
+        self.assertEqual(
+            cantools.subparsers.utils.format_message(
+                message,
+                b'\x28\x00\x00\x00\x00\x00\x00\x00',
+                True,
+                True),
+            ' expected multiplexer id 8, 16 or 24, but got 10')
+        self.assertEqual(
+            cantools.subparsers.utils.format_message(message,
+                                                     b'\x20\x00',
+                                                     True,
+                                                     True),
+            ' unpack requires at least 64 bits to unpack (got 16)')
+
     def test_single_line_decode(self):
         argv = [
             'cantools',
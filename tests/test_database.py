@@ -1,6 +1,9 @@
 import sys
 import math
 import os
+import random
+import shutil
+import tempfile
 import unittest
 from decimal import Decimal
 from collections import namedtuple
@@ -13,6 +16,7 @@ except ImportError:
 
 import logging
 from xml.etree import ElementTree
+import time
 import timeit
 
 try:
@@ -20,8 +24,19 @@ try:
 except ImportError:
     from io import StringIO
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
 import cantools
 from cantools.database.can.formats import dbc
+from cantools.compat import fopen
 
 
 class CanToolsDatabaseTest(unittest.TestCase):
@@ -213,6 +228,522 @@ class CanToolsDatabaseTest(unittest.TestCase):
         for frame_id in frame_ids:
             db.get_message_by_frame_id(frame_id)
 
+    def test_decode_offset(self):
+        db = cantools.database.load_file('tests/files/foobar.dbc')
+        data = b'\x01\x45\x23\x00\x11\x00\x00\x00'
+        expected = db.decode_message('Foo', data)
+        buf = bytearray(3 * b'\xff' + data + 2 * b'\xff')
+
+        for buf in [buf, memoryview(buf)]:
+            self.assertEqual(db.decode_message('Foo', buf, offset=3), expected)
+            self.assertEqual(
+                db.get_message_by_name('Foo').decode(buf, offset=3),
+                expected)
+
+        # Too short data at the end of the buffer.
+        with self.assertRaises(cantools.db.DecodeError) as cm:
+            db.decode_message('Foo', buf, offset=7)
+
+        self.assertEqual(str(cm.exception),
+                         'unpack requires at least 64 bits to unpack (got 48)')
+
+    def test_decode_signals(self):
+        db = cantools.database.load_file('tests/files/multiplex.dbc')
+        message = db.messages[0]
+
+        # BIT_A is only present if the multiplexer is 24.
+        datas = [
+            (b'\x60\xff\xff\xff\xff\xff\xff\xff', {'BIT_J': 1, 'BIT_A': 1}),
+            (b'\x20\xff\xff\xff\xff\xff\xff\xff', {'BIT_J': 1})
+        ]
+
+        for data, expected in datas:
+            self.assertEqual(message.decode(data, signals=['BIT_A', 'BIT_J']),
+                             expected)
+            self.assertEqual(db.decode_message(message.frame_id,
+                                               data,
+                                               signals=['BIT_A', 'BIT_J']),
+                             expected)
+
+        view = message.create_view(['Multiplexor', 'BIT_A'])
+        self.assertEqual(view.signals, ['Multiplexor', 'BIT_A'])
+        self.assertEqual(view.decode(datas[0][0]),
+                         {'Multiplexor': 24, 'BIT_A': 1})
+        self.assertEqual(view.decode(b'\xff' + datas[1][0], offset=1),
+                         {'Multiplexor': 8})
+
+        # Same errors as when decoding all signals.
+        with self.assertRaises(cantools.db.DecodeError) as cm:
+            view.decode(b'\x08\xff\xff\xff\xff\xff\xff\xff')
+
+        self.assertEqual(str(cm.exception),
+                         'expected multiplexer id 8, 16 or 24, but got 2')
+
+        with self.assertRaises(KeyError) as cm:
+            message.create_view(['Missing'])
+
+        self.assertEqual(str(cm.exception), "'Missing'")
+
+    def test_decode_row(self):
+        db = cantools.database.load_file('tests/files/multiplex_choices.dbc')
+        message = db.get_message_by_name('Message1')
+        data = b'\x20\x00\x00\x00\x00\x00\x00\x00'
+
+        self.assertEqual(message.row_type._fields,
+                         ('Multiplexor', 'BIT_J', 'BIT_C', 'BIT_G', 'BIT_L',
+                          'BIT_A', 'BIT_K', 'BIT_E', 'BIT_D', 'BIT_B',
+                          'BIT_H', 'BIT_F'))
+
+        row = message.decode_row(data)
+        self.assertIsInstance(row, message.row_type)
+        self.assertEqual(row.Multiplexor, 'MULTIPLEXOR_8')
+        self.assertEqual(row.BIT_L, 'Off')
+        self.assertIsNone(row.BIT_A)
+        self.assertEqual(
+            {name: value for name, value in row._asdict().items()
+             if value is not None},
+            message.decode(data))
+
+        # Preallocated row. Values of signals not in the message are
+        # not written.
+        row = 12 * [-1]
+        self.assertIs(message.decode_row(data, row, decode_choices=False), row)
+        self.assertEqual(row, [8, 0, 0, 0, 0, -1, -1, -1, -1, -1, -1, -1])
+
+        with self.assertRaises(cantools.db.DecodeError) as cm:
+            message.decode_row(b'\x28\x00\x00\x00\x00\x00\x00\x00')
+
+        self.assertEqual(str(cm.exception),
+                         'expected multiplexer id 8, 16 or 24, but got 10')
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_decode_row_numpy(self):
+        db = cantools.database.load_file('tests/files/foobar.dbc')
+        message = db.get_message_by_name('Fum')
+        rows = numpy.zeros((2, 2))
+        message.decode_row(b'\x09\x50\x00\x00\x00', rows[1])
+
+        self.assertEqual(rows.tolist(), [[0, 0], [9, 5]])
+
+        # Choices are not decoded into numeric rows.
+        signal = cantools.db.Signal('S0', 0, 8, choices={1: 'One'})
+        message = cantools.db.Message(1, 'M0', 1, [signal])
+        row = numpy.zeros(1)
+        message.decode_row(b'\x01', row)
+
+        self.assertEqual(row.tolist(), [1])
+        self.assertEqual(message.decode_row(b'\x01', [None]), ['One'])
+
+    def test_encode_update(self):
+        db = cantools.database.load_file('tests/files/foobar.dbc')
+        message = db.get_message_by_name('Foo')
+        data = message.encode({'Foo': 250, 'Bar': 1})
+        data = message.encode_update(data, {'Foo': 260})
+
+        self.assertEqual(data, b'\x00\x7d\x00\x00\x82\x40\x00\x00')
+        self.assertEqual(message.decode(data), {'Foo': 260.0, 'Bar': 1.0})
+
+        with self.assertRaises(cantools.db.EncodeError) as cm:
+            message.encode_update(data, {'Foo': 300})
+
+        self.assertEqual(
+            str(cm.exception),
+            "Expected signal 'Foo' value less than or equal to 270.47 in "
+            "message 'Foo', but got 300.")
+
+        with self.assertRaises(cantools.db.EncodeError) as cm:
+            message.encode_update(data[:4], {'Foo': 260})
+
+        self.assertEqual(str(cm.exception),
+                         'Expected at least 8 bytes of data, but got 4.')
+
+        # Unknown signals are only ignored if not strict.
+        with self.assertRaises(cantools.db.EncodeError) as cm:
+            message.encode_update(data, {'Fooo': 260})
+
+        self.assertEqual(str(cm.exception),
+                         "Expected a signal of message 'Foo', but got 'Fooo'.")
+        self.assertEqual(message.encode_update(data,
+                                               {'Fooo': 260},
+                                               strict=False),
+                         data)
+
+        # Multiplexed message.
+        db = cantools.database.load_file('tests/files/multiplex_choices.dbc')
+        message = db.get_message_by_name('Message1')
+        data = b'\x60\x00\x00\x00\x00\x00\x00\x00'
+        data = message.encode_update(data, {'BIT_A': 1, 'BIT_L': 'On'})
+
+        self.assertEqual(data, b'\x60\x00\x00\x05\x00\x00\x00\x00')
+
+        # BIT_A is not in the message if the multiplexer is 8.
+        data = b'\x20\x00\x00\x00\x00\x00\x00\x00'
+        self.assertEqual(message.encode_update(data, {'BIT_A': 1}), data)
+
+        with self.assertRaises(cantools.db.EncodeError) as cm:
+            message.encode_update(data, {'Multiplexor': 24})
+
+        self.assertEqual(str(cm.exception),
+                         "Expected a signal, but got multiplexer 'Multiplexor'.")
+
+        with self.assertRaises(cantools.db.EncodeError) as cm:
+            message.encode_update(b'\x28\x00\x00\x00\x00\x00\x00\x00',
+                                  {'BIT_A': 1})
+
+        self.assertEqual(str(cm.exception),
+                         'expected multiplexer id 8, 16 or 24, but got 10')
+
+    def test_try_decode(self):
+        errors = cantools.database.errors
+        db = cantools.database.load_file('tests/files/multiplex_choices.dbc')
+        message = db.get_message_by_name('Message1')
+        data = b'\x20\x00\x00\x00\x00\x00\x00\x00'
+
+        self.assertEqual(message.try_decode(data), (message.decode(data), None))
+        self.assertEqual(db.try_decode_message('Message1', data),
+                         (message.decode(data), None))
+        self.assertEqual(message.try_decode(data[:2]),
+                         (None, errors.DECODE_ERROR_DATA_TOO_SHORT))
+        self.assertEqual(
+            message.try_decode(b'\x28\x00\x00\x00\x00\x00\x00\x00'),
+            (None, errors.DECODE_ERROR_BAD_MULTIPLEXER_ID))
+        self.assertEqual(db.try_decode_message(0x1f3, data),
+                         (None, errors.DECODE_ERROR_UNKNOWN_MESSAGE))
+        self.assertEqual(db.try_decode_message('Missing', data),
+                         (None, errors.DECODE_ERROR_UNKNOWN_MESSAGE))
+        self.assertIsNone(db.try_get_message_by_frame_id(0x1f3))
+        self.assertIs(db.try_get_message_by_frame_id(message.frame_id),
+                      message)
+
+    def test_decode_many(self):
+        db = cantools.db.Database()
+        db.add_dbc_file(os.path.join('tests', 'files', 'foobar.dbc'))
+        db.add_dbc_file(os.path.join('tests', 'files', 'multiplex_choices.dbc'))
+
+        frames = [
+            (0x12331, b'\x09\x50\x00\x00\x00'),
+            (0x123457, b'\x20\x00\x00\x00\x00\x00\x00\x00'),
+            (0x99, b'\x00'),
+            (0x12332, b'\x00\x00\x80\x3f'),
+            (0x123457, b'\x60\xff\xff\xff\xff\xff\xff\xff'),
+            (0x12331, b'\x00\x00\x00\x00\x00\x00\x00\x00'),
+            (0x123457, b'\x10\x00\x00\x00\x00\x00\x00\x00')
+        ]
+
+        self.assertEqual(
+            db.decode_many(frames),
+            {
+                'Fum': {'Fum': [9, 0], 'Fam': [5, 'Disabled']},
+                'Bar': {'Binary32': [1.0]},
+                'Message2': {
+                    'Multiplexor': [
+                        'MULTIPLEXOR_8',
+                        'MULTIPLEXOR_24',
+                        'MULTIPLEXOR_4_NO_SIGNALS'
+                    ],
+                    'BIT_J': [0, 1, None],
+                    'BIT_C': [0, 1, None],
+                    'BIT_G': [0, 1, None],
+                    'BIT_L': [0, 1, None],
+                    'BIT_A': [None, 1, None],
+                    'BIT_K': [None, 1, None],
+                    'BIT_E': [None, 1, None],
+                    'BIT_D': [None, 1, None],
+                    'BIT_B': [None, 1, None],
+                    'BIT_H': [None, 1, None],
+                    'BIT_F': [None, 1, None]
+                }
+            })
+
+        # Same as decoding one frame at a time.
+        message = db.get_message_by_name('Message2')
+        datas = [data for frame_id, data in frames if frame_id == 0x123457]
+        decoded = message.decode_many(datas, decode_choices=False)
+
+        for i, data in enumerate(datas):
+            self.assertEqual(
+                {
+                    name: values[i]
+                    for name, values in decoded.items()
+                    if values[i] is not None
+                },
+                message.decode(data, decode_choices=False))
+
+        # Bad multiplexer id.
+        with self.assertRaises(cantools.db.DecodeError) as cm:
+            message.decode_many([b'\x24\x00\x00\x00\x00\x00\x00\x00'])
+
+        self.assertEqual(str(cm.exception),
+                         'expected multiplexer id 8, 16, 4 or 24, but got 9')
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_decode_array(self):
+        db = cantools.database.load_file('tests/files/foobar.dbc')
+        message = db.get_message_by_name('Foo')
+        datas = [
+            b'\x01\x45\x23\x00\x11\x00\x00\x00',
+            b'\x00\x45\x23\x00\x13\x00\x00\x00',
+            b'\xff\xf0\x00\x3f\x80\x00\x00\x00'
+        ]
+        payloads = numpy.array([bytearray(data) for data in datas],
+                               dtype=numpy.uint8)
+        decoded = message.decode_array(payloads)
+
+        self.assertEqual(sorted(decoded), ['Bar', 'Foo'])
+
+        for i, data in enumerate(datas):
+            self.assertEqual({name: values[i] for name, values in decoded.items()},
+                             message.decode(data))
+
+        decoded = message.decode_array(payloads, scaling=False)
+        self.assertEqual(decoded['Foo'].tolist(), [-1495, 553, -128])
+
+        # Multiplexed signals are masked when not present.
+        db = cantools.database.load_file('tests/files/multiplex.dbc')
+        message = db.get_message_by_name('Message1')
+        payloads = numpy.array([[0x60] + 7 * [0],
+                                [0x20] + 7 * [0xff],
+                                [0x60] + 7 * [0xff]],
+                               dtype=numpy.uint8)
+        decoded = message.decode_array(payloads)
+
+        self.assertEqual(decoded['Multiplexor'].tolist(), [24, 8, 24])
+        self.assertEqual(decoded['BIT_J'].tolist(), [0, 1, 1])
+        self.assertEqual(decoded['BIT_A'].tolist(), [0, None, 1])
+        self.assertIsInstance(decoded['BIT_A'], numpy.ma.MaskedArray)
+
+        # Bad multiplexer id.
+        payloads[1, 0] = 0x24
+
+        with self.assertRaises(cantools.db.DecodeError) as cm:
+            message.decode_array(payloads)
+
+        self.assertEqual(str(cm.exception),
+                         'expected multiplexer id 8, 16 or 24, but got 9')
+
+        # Integer scaling out of 64 bits range.
+        payloads = numpy.array([8 * [0xff], 8 * [0], [1] + 7 * [0]],
+                               dtype=numpy.uint8)
+
+        for signal in [cantools.db.Signal('A', 0, 64, offset=-1),
+                       cantools.db.Signal('A', 0, 64, scale=2),
+                       cantools.db.Signal('A', 0, 64, is_signed=True, scale=3),
+                       cantools.db.Signal('A', 0, 8, offset=-1, scale=-2)]:
+            message = cantools.db.Message(1, 'M', 8, [signal])
+            decoded = message.decode_array(payloads)
+
+            self.assertEqual(decoded['A'].tolist(),
+                             [message.decode(bytes(bytearray(payload)))['A']
+                              for payload in payloads])
+
+        # Float signals with integer scale and offset.
+        db = cantools.database.load_file('tests/files/jopp-6.0.sym')
+        message = db.get_message_by_name('Message1')
+        datas = [
+            b'\x00\x00\x00\x00\x00\x00\x00\x00',
+            b'\x00\x00\x00\x00\x00\x00\x58\xc1',
+            b'\x00\x00\x00\x00\x00\x00\x7f\x7f'
+        ]
+        payloads = numpy.array([bytearray(data) for data in datas],
+                               dtype=numpy.uint8)
+        decoded = message.decode_array(payloads)
+
+        self.assertEqual(decoded['Signal2'].tolist(),
+                         [message.decode(data)['Signal2'] for data in datas])
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_encode_array(self):
+        db = cantools.database.load_file('tests/files/foobar.dbc')
+        message = db.get_message_by_name('Foo')
+        data = {
+            'Foo': numpy.array([235.05, 255.53, 248.72]),
+            'Bar': numpy.array([0.0, 1.0, 0.2])
+        }
+        encoded = message.encode_array(data)
+
+        self.assertEqual(encoded.shape, (3, 8))
+
+        for i in range(3):
+            self.assertEqual(
+                bytes(bytearray(encoded[i])),
+                message.encode({name: values[i] for name, values in data.items()}))
+
+        with self.assertRaises(cantools.db.EncodeError) as cm:
+            message.encode_array({
+                'Foo': numpy.array([235.05, 300.0]),
+                'Bar': numpy.array([0.0, 0.0])
+            })
+
+        self.assertEqual(
+            str(cm.exception),
+            "Expected signal 'Foo' value less than or equal to 270.47 in "
+            "message 'Foo', but got 300.0.")
+
+        with self.assertRaises(cantools.db.EncodeError) as cm:
+            message.encode_array({
+                'Foo': numpy.array([235.05, 250.0]),
+                'Bar': numpy.array([0.0])
+            })
+
+        self.assertEqual(
+            str(cm.exception),
+            'Expected arrays of equal lengths, but got lengths 1 and 2.')
+
+        # Wide integer signals are scaled without loss of precision.
+        for signal, values in [
+                (cantools.db.Signal('A', 0, 60, offset=-3), [2**58 + 1, 0]),
+                (cantools.db.Signal('A', 0, 16, is_signed=True, scale=3,
+                                    offset=-7), list(range(-50, 50))),
+                (cantools.db.Signal('A', 0, 64, offset=-1), [2**63 - 1, -1])]:
+            wide = cantools.db.Message(1, 'M', 8, [signal])
+            encoded = wide.encode_array(
+                {'A': numpy.array(values, dtype=numpy.int64)})
+
+            for i, value in enumerate(values):
+                self.assertEqual(bytes(bytearray(encoded[i])),
+                                 wide.encode({'A': value}))
+
+        # Multiplexed message with padding.
+        db = cantools.database.load_file('tests/files/multiplex.dbc')
+        message = db.get_message_by_name('Message1')
+        datas = [
+            b'\x60\x00\x00\x00\x00\x00\x00\x00',
+            b'\x20\xff\xff\xff\xff\xff\xff\xff',
+            b'\x60\xff\xff\xff\xff\xff\xff\xff'
+        ]
+        decoded = [message.decode(data) for data in datas]
+        data = {
+            signal.name: numpy.array([values.get(signal.name, 0)
+                                      for values in decoded])
+            for signal in message.signals
+        }
+
+        for padding in [False, True]:
+            encoded = message.encode_array(data, padding=padding)
+
+            for i, values in enumerate(decoded):
+                self.assertEqual(bytes(bytearray(encoded[i])),
+                                 message.encode(values, padding=padding))
+
+        # Bad multiplexer id.
+        data['Multiplexor'][1] = 9
+
+        with self.assertRaises(cantools.db.EncodeError) as cm:
+            message.encode_array(data)
+
+        self.assertEqual(str(cm.exception),
+                         'expected multiplexer id 8, 16 or 24, but got 9')
+
+    def test_lazy_load(self):
+        filename = os.path.join('tests', 'files', 'vehicle.dbc')
+        db = cantools.database.load_file(filename)
+        lazy_db = cantools.database.load_file(filename, lazy=True)
+
+        # Messages are loaded when found.
+        message = lazy_db.get_message_by_name('RT_SB_INS_Vel_Body_Axes')
+        self.assertIs(lazy_db.get_message_by_frame_id(message.frame_id),
+                      message)
+        index = db.messages.index(
+            db.get_message_by_name('RT_SB_INS_Vel_Body_Axes'))
+        self.assertIs(lazy_db._messages[index], message)
+        self.assertEqual(
+            lazy_db.decode_message(message.frame_id,
+                                   b'\x00\x00\x98\xf7\xff\xff\x00\x00'),
+            db.decode_message(message.frame_id,
+                              b'\x00\x00\x98\xf7\xff\xff\x00\x00'))
+
+        # All messages are loaded when accessed.
+        self.assertIn(message, lazy_db.messages)
+        self.assertEqual(repr(lazy_db), repr(db))
+        self.assertEqual(lazy_db.as_dbc_string(), db.as_dbc_string())
+
+        # Errors are raised when a message is loaded.
+        filename = os.path.join('tests', 'files', 'issue_63.dbc')
+        db = cantools.database.load_file(filename, lazy=True)
+
+        with self.assertRaises(cantools.database.errors.Error) as cm:
+            db.get_message_by_name('AFT1PSI2')
+
+        self.assertEqual(
+            str(cm.exception),
+            'The signals HtrRes and MaxRes are overlapping in message '
+            'AFT1PSI2.')
+
+    def test_formats_cache(self):
+        utils = cantools.database.utils
+        utils.formats_cache_clear()
+        self.assertEqual(utils.formats_cache_info(), (0, 0, 4096, 0))
+
+        signals = [
+            cantools.db.Signal('S0', 0, 16, 'little_endian'),
+            cantools.db.Signal('S1', 16, 16, 'little_endian', is_signed=True)
+        ]
+        message_1 = cantools.db.Message(1, 'M1', 4, signals)
+        message_2 = cantools.db.Message(2, 'M2', 4, signals)
+
+        # Messages with the same layout share formats.
+        self.assertIs(message_1._codecs['formats'],
+                      message_2._codecs['formats'])
+        self.assertEqual(utils.formats_cache_info(), (1, 1, 4096, 1))
+
+        # Another message length gives other formats.
+        message_3 = cantools.db.Message(3, 'M3', 8, signals)
+        self.assertIsNot(message_3._codecs['formats'],
+                         message_1._codecs['formats'])
+        self.assertEqual(message_3.encode({'S0': 1, 'S1': -1}),
+                         b'\x01\x00\xff\xff\x00\x00\x00\x00')
+        self.assertEqual(utils.formats_cache_info(), (1, 2, 4096, 2))
+
+    def test_snapshot(self):
+        with open(os.path.join('tests', 'files', 'foobar.dbc'), 'rb') as fin:
+            dbc = fin.read()
+
+        directory = tempfile.mkdtemp()
+        filename = os.path.join(directory, 'test_database_snapshot.dbc')
+        snapshot_filename = os.path.join(directory,
+                                         'test_database_snapshot.snapshot')
+
+        try:
+            with open(filename, 'wb') as fout:
+                fout.write(dbc)
+
+            db = cantools.database.load_file(filename)
+            db.save_snapshot(snapshot_filename, filename)
+            snapshot_db = cantools.database.load_snapshot(snapshot_filename,
+                                                          filename)
+
+            self.assertEqual(snapshot_db.as_dbc_string(), db.as_dbc_string())
+            self.assertEqual(
+                snapshot_db.decode_message('Bar', b'\x00\x00\x80\x3f'),
+                {'Binary32': 1.0})
+
+            # Unchanged contents with a new modification time.
+            os.utime(filename, (0, 0))
+            cantools.database.load_snapshot(snapshot_filename, filename)
+
+            # Modified database file.
+            with open(filename, 'wb') as fout:
+                fout.write(dbc.replace(b'Foo', b'Fie'))
+
+            with self.assertRaises(cantools.database.Error) as cm:
+                cantools.database.load_snapshot(snapshot_filename, filename)
+
+            self.assertEqual(
+                str(cm.exception),
+                "The snapshot '{}' is out of date with '{}'.".format(
+                    snapshot_filename,
+                    filename))
+
+            # Not a snapshot.
+            with self.assertRaises(cantools.database.Error) as cm:
+                cantools.database.load_snapshot(filename)
+
+            self.assertEqual(
+                str(cm.exception),
+                "Expected a snapshot file, but got '{}'.".format(filename))
+        finally:
+            shutil.rmtree(directory)
+
     def test_dbc_dump_val_table(self):
         filename = os.path.join('tests', 'files', 'val_table.dbc')
         db = cantools.database.load_file(filename)
@@ -523,6 +1054,13 @@ class CanToolsDatabaseTest(unittest.TestCase):
                               {'Signal1': signal_value},
                               strict=False)
 
+        # Value does not fit in the signal.
+        with self.assertRaises(cantools.database.EncodeError) as cm:
+            db.encode_message('Message1', {'Signal1': 300}, strict=False)
+
+        self.assertEqual(str(cm.exception),
+                         '"u8" requires 0 <= integer <= 255 (got 300)')
+
         # Missing value.
         with self.assertRaises(cantools.database.EncodeError) as cm:
             db.encode_message('Message1', {'Foo': 1})
@@ -2020,6 +2558,65 @@ class CanToolsDatabaseTest(unittest.TestCase):
             r"VWXYZ[\]^_`abcdefghijklmnopqrstuvwxyz{|}~"
             + replaced)
 
+    def test_multiplexed_message_create(self):
+        """Test that the work to create a multiplexed message is linear in
+        the number of multiplexer ids, by counting how many times the
+        multiplexer signal of a signal is read.
+
+        """
+
+        def create_signals(number_of_ids):
+            signals = [
+                cantools.db.Signal('Mux',
+                                   0,
+                                   8,
+                                   'little_endian',
+                                   is_multiplexer=True)
+            ]
+
+            for multiplexer_id in range(number_of_ids):
+                for i in range(4):
+                    signals.append(
+                        cantools.db.Signal('S{}_{}'.format(multiplexer_id, i),
+                                           8 + 8 * i,
+                                           8,
+                                           'little_endian',
+                                           multiplexer_ids=[multiplexer_id],
+                                           multiplexer_signal='Mux'))
+
+            return signals
+
+        multiplexer_signal = cantools.db.Signal.multiplexer_signal
+        reads = []
+
+        def get_multiplexer_signal(signal):
+            reads.append(signal)
+
+            return multiplexer_signal.fget(signal)
+
+        reads_per_signal = []
+
+        for number_of_ids in [32, 256]:
+            signals = create_signals(number_of_ids)
+            del reads[:]
+
+            with patch.object(cantools.db.Signal,
+                              'multiplexer_signal',
+                              property(get_multiplexer_signal)):
+                message = cantools.db.Message(1, 'M', 8, signals)
+
+            reads_per_signal.append(len(reads) / float(len(signals)))
+
+        self.assertEqual(len(message.signal_tree[0]['Mux']), 256)
+        self.assertEqual(message.signal_tree[0]['Mux'][255],
+                         ['S255_0', 'S255_1', 'S255_2', 'S255_3'])
+
+        # Each signal is read a fixed number of times. Rescanning all
+        # signals for each multiplexer id would read each signal 256
+        # times.
+        self.assertEqual(reads_per_signal[0], reads_per_signal[1])
+        self.assertLessEqual(reads_per_signal[1], 2)
+
     def test_performance_big_endian_signals(self):
         """Test encode/decode performance of a frame with big endian signals.
 
@@ -2067,6 +2664,259 @@ class CanToolsDatabaseTest(unittest.TestCase):
 
         print("Decode time: {} s ({} s/decode)".format(time, time / iterations))
 
+    def test_performance_choices(self):
+        """Test encode performance of a signal with many choices, and that
+        choice strings are found after modifying the choices.
+
+        """
+
+        iterations = 10000
+        choices = {value: 'DTC{}'.format(value) for value in range(4096)}
+        signal = cantools.db.Signal('S0', 0, 16, choices=choices)
+        message = cantools.db.Message(frame_id=1,
+                                      name='M0',
+                                      length=2,
+                                      signals=[signal])
+
+        def encode():
+            message.encode({'S0': 'DTC4000'})
+
+        time = timeit.timeit(encode, number=iterations)
+
+        print()
+        print("Encode time: {} s ({} s/encode)".format(time, time / iterations))
+
+        self.assertEqual(message.encode({'S0': 'DTC4000'}), b'\xa0\x0f')
+        self.assertEqual(signal.choice_string_to_number('DTC4000'), 4000)
+        self.assertIsNone(signal.choice_string_to_number('Missing'))
+
+        with self.assertRaises(cantools.db.EncodeError) as cm:
+            message.encode({'S0': 'Missing'})
+
+        self.assertEqual(
+            str(cm.exception),
+            "Expected a choice string of 'S0', but got 'Missing'.")
+
+        # The reverse lookup table is recreated when refreshed.
+        choices[4000] = 'Replaced'
+        choices[5000] = 'DTC4000'
+        message.refresh()
+        self.assertEqual(signal.choice_string_to_number('DTC4000'), 5000)
+        self.assertEqual(signal.choice_string_to_number('Replaced'), 4000)
+
+        # The reverse lookup table is recreated if choices are modified
+        # in place without refreshing.
+        choices[6000] = 'Added'
+        self.assertEqual(message.encode({'S0': 'Added'}), b'\x70\x17')
+        del choices[6000]
+        self.assertIsNone(signal.choice_string_to_number('Added'))
+
+    @unittest.skipIf(tracemalloc is None, 'tracemalloc is not available')
+    def test_performance_memory_per_signal(self):
+        """Test memory usage of a large database, and that units, receivers
+        and decimals are shared between signals.
+
+        """
+
+        number_of_messages = 500
+        number_of_signals = 16
+        lines = ['VERSION ""', 'NS_ :', 'BS_:', 'BU_: ECU1 ECU2']
+
+        for i in range(number_of_messages):
+            lines.append('BO_ {} M{}: 8 ECU1'.format(i + 1, i))
+
+            for j in range(number_of_signals):
+                lines.append(
+                    ' SG_ S{}_{} : {}|4@1+ (0.1,-40) [-40|-38.5] "degC" '
+                    'ECU2'.format(i, j, 4 * j))
+
+        string = '\n'.join(lines) + '\n'
+        tracemalloc.start()
+
+        try:
+            db = cantools.db.load_string(string)
+            size = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+        print()
+        print("Memory usage: {} bytes/signal".format(
+            size // (number_of_messages * number_of_signals)))
+
+        signal_1 = db.messages[0].signals[0]
+        signal_2 = db.messages[-1].signals[-1]
+        self.assertFalse(hasattr(signal_1, '__dict__'))
+        self.assertIs(signal_1.unit, signal_2.unit)
+        self.assertIs(signal_1.receivers[0], signal_2.receivers[0])
+        self.assertIs(signal_1.decimal.scale, signal_2.decimal.scale)
+        self.assertEqual(signal_2.decimal.minimum, Decimal('-40'))
+
+    def test_dbc_scan_messages(self):
+        """Test that messages are scanned as parsed by the parser. See
+        examples/benchmark/dbc_parse.py for the parse time.
+
+        """
+
+        number_of_messages = 20
+        number_of_signals = 8
+        lines = ['VERSION ""', 'NS_ :', 'BS_:', 'BU_: ECU1 ECU2']
+
+        for i in range(number_of_messages):
+            lines.append('BO_ {} M{}: 8 ECU1'.format(i + 1, i))
+
+            for j in range(number_of_signals):
+                lines.append(
+                    ' SG_ S{}_{} : {}|4@0- (0.1,-4.0E1) [-40|-38.5] '
+                    '"degC" ECU2,ECU1'.format(i,
+                                              j,
+                                              8 * (j // 2) + 7 - 4 * (j % 2)))
+
+        lines.append('CM_ BO_ 1 "A comment.";')
+        string = '\n'.join(lines) + '\n'
+
+        self.assertEqual(len(dbc._scan_messages(string)[1]),
+                         number_of_messages)
+        self.assertEqual(dbc._parse(string), dbc.Parser().parse(string))
+
+        # Signals that can not be scanned, or that may not be signals,
+        # are parsed by the parser.
+        strings = [
+            string + ('BO_ 1000 M1000: 8 ECU1\n'
+                      ' SG_ S : 0|4@1+ (1,0) [0|0] "\\"" ECU2\n'),
+            string + ('CM_ "\nBO_ 1000 M1000: 8 ECU1\n'
+                      ' SG_ S : 0|4@1+ (1,0) [0|0] "" ECU2\n";\n'),
+            string.replace('CM_ BO_', 'ECU3\nCM_ BO_'),
+            string.replace('BO_ 10 M9', 'NS_ : \nBO_ 10 M9'),
+            string.replace('BO_ 10 M9', ', ECU3\nBO_ 10 M9'),
+            string[:-10]
+        ]
+
+        for string in strings:
+            try:
+                expected = dbc.Parser().parse(string)
+            except textparser.ParseError as e:
+                with self.assertRaises(textparser.ParseError) as cm:
+                    dbc._parse(string)
+
+                self.assertEqual(str(cm.exception), str(e))
+            else:
+                self.assertEqual(dbc._parse(string), expected)
+
+    def test_dbc_parse_file(self):
+        """Test that DBC files are parsed line by line as parsed by the
+        parser, also when modified to be invalid.
+
+        """
+
+        filenames = [
+            os.path.join('tests', 'files', filename)
+            for filename in sorted(os.listdir(os.path.join('tests', 'files')))
+            if filename.endswith('.dbc')
+        ]
+
+        for filename in filenames:
+            with fopen(filename, 'r', encoding='cp1252') as fin:
+                string = fin.read()
+
+            expected = dbc.Parser().parse(string)
+
+            with fopen(filename, 'r', encoding='cp1252') as fin:
+                self.assertEqual(dbc.FileParser().parse(fin), expected)
+
+        # Compare with the parser when inserting and removing lines.
+        def parse(parser, string):
+            try:
+                return parser(string)
+            except textparser.ParseError as e:
+                return str(e)
+
+        parsers = [
+            dbc._parse,
+            lambda string: dbc.FileParser().parse(StringIO(string))
+        ]
+        snippets = [
+            'NS_ : ', 'NS_ : "Q:"', '"', 'CM_ "', ',', ', ECU1', ';', ':',
+            'BO_', 'BS_:', 'BU_:', '// "', 'BO_ 99 M99: 8 ECU1',
+            ' SG_ S : 0|8@1+ (1,0) [0|0] "" ECU1',
+            ' SG_ BO_ : 0|8@1+ (1,0) [0|0] "" ECU1'
+        ]
+        generator = random.Random(0)
+
+        for filename in ['foobar.dbc', 'motohawk.dbc', 'multiplex_2.dbc']:
+            with open(os.path.join('tests', 'files', filename)) as fin:
+                lines = fin.read().splitlines()
+
+            for _ in range(100):
+                modified = list(lines)
+
+                for _ in range(generator.randint(1, 3)):
+                    index = generator.randrange(len(modified))
+
+                    if generator.random() < 0.8:
+                        modified.insert(index, generator.choice(snippets))
+                    else:
+                        del modified[index]
+
+                string = '\n'.join(modified) + '\n'
+                expected = parse(dbc.Parser().parse, string)
+
+                for parser in parsers:
+                    self.assertEqual(parse(parser, string), expected)
+
+        # Files that can not be read again are read at once.
+        fin = StringIO(string)
+
+        with patch.object(fin, 'tell', side_effect=IOError):
+            self.assertEqual(parse(dbc.FileParser().parse, fin), expected)
+
+        # Errors are reported at lines in the file.
+        string = ('VERSION ""\n'
+                  'BU_\n'
+                  '\n'
+                  'BO_ 1 M0: 8 ECU1\n'
+                  ' SG_ S0 : 0|4@1+ (1,0) [0|0] "" ECU2\n')
+
+        with self.assertRaises(textparser.ParseError) as cm:
+            dbc.FileParser().parse(StringIO(string))
+
+        self.assertEqual(str(cm.exception),
+                         'Invalid syntax at line 4, column 1: ">>!<<BO_ 1 M0: '
+                         '8 ECU1"')
+
+        db = cantools.db.load(StringIO(string.replace('BU_', 'BU_:')),
+                              'dbc')
+        self.assertEqual(db.messages[0].signals[0].receivers, ['ECU2'])
+
+    def test_encode_scaling_rounding(self):
+        """Scaled integer signal values are rounded half to even, as done by
+        Decimal.
+
+        """
+
+        signals = [
+            cantools.db.Signal('S0', 0, 8, is_signed=True, scale=2),
+            cantools.db.Signal('S1', 8, 8, is_signed=True, scale=0.1),
+            cantools.db.Signal('S2', 16, 8, scale=0.5, offset=-40),
+            cantools.db.Signal('S3', 24, 16, scale=0.001, offset=0.5)
+        ]
+        message = cantools.db.Message(frame_id=1,
+                                      name='M0',
+                                      length=5,
+                                      signals=signals)
+        datas = [
+            ({'S0': 3, 'S1': 0.25, 'S2': -39.75, 'S3': 0.5015},
+             b'\x02\x02\x00\x01\x00'),
+            ({'S0': -3, 'S1': -0.35, 'S2': -39.25, 'S3': 0.5025},
+             b'\xfe\xfd\x02\x02\x00'),
+            ({'S0': 5, 'S1': 1.15, 'S2': 10.25, 'S3': 65.5344},
+             b'\x02\x0b\x64\x0a\xfe'),
+            ({'S0': 7.0, 'S1': 2, 'S2': 0, 'S3': 1},
+             b'\x04\x14\x50\xf4\x01')
+        ]
+
+        for decoded, encoded in datas:
+            self.assertEqual(message.encode(decoded, strict=False), encoded)
+
     def test_padding_one(self):
         """Test to encode a message with padding as one.
 
@@ -2396,6 +3246,100 @@ class CanToolsDatabaseTest(unittest.TestCase):
 
         self.assertEqual(cm.exception.args[0], 0x41)
 
+        # Signal and node names.
+        signal = message.signals[0]
+        signal.name = 'TheNewSignal'
+        message.refresh()
+        self.assertIs(message.get_signal_by_name('TheNewSignal'), signal)
+
+        node = cantools.db.Node('TheNewNode', None)
+        db.nodes.append(node)
+        db.refresh()
+        self.assertIs(db.get_node_by_name('TheNewNode'), node)
+
+    def test_refresh_modified(self):
+        """Test that only modified messages are refreshed.
+
+        """
+
+        db = cantools.db.Database()
+
+        with patch.object(cantools.db.Message,
+                          'refresh',
+                          autospec=True,
+                          side_effect=cantools.db.Message.refresh) as refresh:
+            # Added messages are only refreshed when created.
+            db.add_dbc_file(os.path.join('tests', 'files', 'motohawk.dbc'))
+            db.add_dbc_file(os.path.join('tests', 'files', 'foobar.dbc'))
+            db.refresh()
+            self.assertEqual(refresh.call_count, len(db.messages))
+            refresh.reset_mock()
+
+            # Signal and message property setters.
+            message = db.get_message_by_name('ExampleMessage')
+            message.get_signal_by_name('AverageRadius').scale = 1
+            db.refresh()
+            self.assertEqual(refresh.call_count, 1)
+            self.assertEqual(
+                db.decode_message(496, b'\xc0\x06\xe0\x00\x00\x00\x00\x00'),
+                {
+                    'Enable': 'Enabled',
+                    'AverageRadius': 32,
+                    'Temperature': 250.55
+                })
+
+            message.length = 4
+            db.refresh()
+            self.assertEqual(refresh.call_count, 2)
+
+            # Added and removed signals.
+            message.signals.append(cantools.db.Signal('Foo', 24, 8))
+            db.refresh()
+            self.assertEqual(refresh.call_count, 3)
+            self.assertEqual(
+                message.decode(b'\xc0\x06\xe0\x05')['Foo'], 5)
+
+            del message.signals[-1]
+            db.refresh()
+            self.assertEqual(refresh.call_count, 4)
+            db.refresh()
+            self.assertEqual(refresh.call_count, 4)
+
+            # Replaced signals.
+            message.signals[-1] = cantools.db.Signal('Foo', 24, 8)
+            db.refresh()
+            self.assertEqual(refresh.call_count, 5)
+            self.assertEqual(
+                message.decode(b'\xc0\x06\xe0\x05')['Foo'], 5)
+            self.assertEqual([call[0][0] for call in refresh.call_args_list],
+                             5 * [message])
+
+            # Signal choices modified in place do not need a refresh of
+            # their message, but reverse lookup tables are recreated.
+            enable = message.get_signal_by_name('Enable')
+            self.assertEqual(enable.choice_string_to_number('Enabled'), 1)
+            enable.choices[0] = 'Enabled'
+            enable.choices[1] = 'Disabled'
+            db.refresh()
+            self.assertEqual(refresh.call_count, 5)
+            self.assertEqual(enable.choice_string_to_number('Enabled'), 0)
+
+        # Modified multiplexer choices.
+        db = cantools.db.load_file(
+            os.path.join('tests', 'files', 'multiplex_choices.dbc'))
+        message = db.get_message_by_name('Message1')
+        multiplexer = message.get_signal_by_name('Multiplexor')
+
+        with patch.object(cantools.db.Message,
+                          'refresh',
+                          autospec=True,
+                          side_effect=cantools.db.Message.refresh) as refresh:
+            db.refresh()
+            self.assertEqual(refresh.call_count, 0)
+            multiplexer.choices[30] = 'MULTIPLEXOR_30'
+            db.refresh()
+            self.assertEqual(refresh.call_count, 1)
+
     def test_missing_dbc_specifics(self):
         db = cantools.db.Database()
 
@@ -2703,6 +3647,36 @@ class CanToolsDatabaseTest(unittest.TestCase):
                                        multiplexer_signal='S6')
                 ],
                 'The signals S6 and S4 are overlapping in message M.'
+            ),
+            (
+                [
+                    cantools.db.Signal('S0',
+                                       0,
+                                       2,
+                                       'little_endian',
+                                       is_multiplexer=True),
+                    cantools.db.Signal('S1',
+                                       2,
+                                       4,
+                                       'little_endian',
+                                       multiplexer_ids=[0],
+                                       multiplexer_signal='S0'),
+                    cantools.db.Signal('S2',
+                                       4,
+                                       4,
+                                       'little_endian',
+                                       multiplexer_ids=[1],
+                                       multiplexer_signal='S0'),
+                    cantools.db.Signal('S3',
+                                       40,
+                                       8,
+                                       'little_endian'),
+                    cantools.db.Signal('S4',
+                                       5,
+                                       1,
+                                       'little_endian')
+                ],
+                'The signals S4 and S2 are overlapping in message M.'
             )
         ]
 
@@ -3193,6 +4167,157 @@ class CanToolsDatabaseTest(unittest.TestCase):
         self.assertEqual(db.get_message_by_name('M1').frame_id, 2)
         self.assertEqual(db.get_message_by_frame_id(2).name, 'M1')
 
+    def test_load_files(self):
+        """Test loading files in parallel.
+
+        """
+
+        filenames = [
+            os.path.join('tests', 'files', 'add_two_dbc_files_1.dbc'),
+            os.path.join('tests', 'files', 'add_two_dbc_files_2.dbc'),
+            os.path.join('tests', 'files', 'motohawk.dbc')
+        ]
+
+        for workers in [None, 1, 2]:
+            db = cantools.database.load_files(filenames, workers=workers)
+            self.assertEqual(len(db.messages), 4)
+            self.assertEqual(db.get_message_by_name('M1').frame_id, 2)
+            self.assertEqual(db.get_message_by_frame_id(2).name, 'M1')
+            self.assertEqual([message.bus_name for message in db.messages],
+                             [
+                                 'add_two_dbc_files_1',
+                                 'add_two_dbc_files_1',
+                                 'add_two_dbc_files_2',
+                                 'motohawk'
+                             ])
+            self.assertEqual([bus.name for bus in db.buses],
+                             [
+                                 'add_two_dbc_files_1',
+                                 'add_two_dbc_files_2',
+                                 'motohawk'
+                             ])
+            self.assertEqual([node.name for node in db.nodes],
+                             ['FOO', 'PCM1'])
+            self.assertEqual(db.get_node_by_name('PCM1').name, 'PCM1')
+            self.assertEqual(
+                db.decode_message('ExampleMessage',
+                                  b'\xc0\x06\xe0\x00\x00\x00\x00\x00'),
+                {
+                    'Temperature': 250.55,
+                    'AverageRadius': 3.2,
+                    'Enable': 'Enabled'
+                })
+
+        # Errors are raised as when loading the files one by one.
+        filenames.append(
+            os.path.join('tests', 'files', 'bad_message_length.kcd'))
+
+        for workers in [1, 2]:
+            with self.assertRaises(cantools.database.Error) as cm:
+                cantools.database.load_files(filenames, workers=workers)
+
+            self.assertEqual(
+                str(cm.exception),
+                'The signal Signal1 does not fit in message Message1.')
+
+        # Parse errors raised by the workers are re-raised.
+        directory = tempfile.mkdtemp()
+
+        try:
+            filenames[-1] = os.path.join(directory, 'bad.dbc')
+
+            with open(filenames[-1], 'w') as fout:
+                fout.write('BO_ 1 Foo 8 FOO\n')
+
+            for workers in [1, 2]:
+                with self.assertRaises(
+                        cantools.database.UnsupportedDatabaseFormatError) as cm:
+                    cantools.database.load_files(filenames, workers=workers)
+
+                self.assertEqual(
+                    str(cm.exception),
+                    'DBC: "Invalid syntax at line 1, column 11: '
+                    '"BO_ 1 Foo >>!<<8 FOO""')
+                self.assertEqual(cm.exception.e_dbc.line, 1)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_watched_database(self):
+        """Test reloading a modified database file.
+
+        """
+
+        directory = tempfile.mkdtemp()
+        filename = os.path.join(directory, 'watched.dbc')
+        db = None
+
+        with open(os.path.join('tests', 'files', 'foobar.dbc'), 'rb') as fin:
+            dbc = fin.read()
+
+        def write(data, mtime):
+            with open(filename, 'wb') as fout:
+                fout.write(data)
+
+            os.utime(filename, (mtime, mtime))
+
+        def wait_for_reload(database):
+            for _ in range(500):
+                if db.database is not database:
+                    break
+
+                time.sleep(0.01)
+
+            self.assertIsNot(db.database, database)
+
+        try:
+            write(dbc, 1)
+            db = cantools.database.WatchedDatabase(filename, interval=0.01)
+            self.assertEqual(repr(db),
+                             "watched_database('{}')".format(filename))
+            fum = db.get_message_by_name('Fum')
+            bar = db.get_message_by_name('Bar')
+            self.assertEqual(db.decode_message('Fum', b'\x01\x45\x23\x00\x11'),
+                             {'Fum': 1281, 'Fam': 564})
+
+            # Not modified.
+            self.assertFalse(db.reload())
+
+            # Modified signal scale. Only the modified message is
+            # loaded by the background thread.
+            database = db.database
+
+            with patch('cantools.database.can.formats.dbc.Message',
+                       wraps=cantools.database.can.Message) as message:
+                write(dbc.replace(b'SG_ Fum : 0|12@1- (1,0)',
+                                  b'SG_ Fum : 0|12@1- (2,0)'),
+                      2)
+                wait_for_reload(database)
+
+            self.assertEqual(message.call_count, 1)
+            self.assertFalse(db.reload())
+            self.assertIsNot(db.get_message_by_name('Fum'), fum)
+            self.assertIs(db.get_message_by_name('Bar'), bar)
+            self.assertIs(db.database.get_message_by_frame_id(bar.frame_id),
+                          bar)
+            self.assertEqual(db.decode_message('Fum', b'\x01\x45\x23\x00\x11'),
+                             {'Fum': 2562, 'Fam': 564})
+
+            # A bad file is not loaded.
+            db.stop()
+            write(b'BO_ 1 Foo 8 FOO\n', 3)
+
+            with self.assertRaises(cantools.database.Error):
+                db.reload()
+
+            self.assertFalse(db.reload())
+            self.assertEqual(db.decode_message('Fum', b'\x01\x45\x23\x00\x11'),
+                             {'Fum': 2562, 'Fam': 564})
+        finally:
+            if db is not None:
+                db.stop()
+
+            shutil.rmtree(directory)
+
     def test_empty_ns_dbc(self):
         """Test loading a DBC-file with empty NS_.
 
@@ -3274,6 +4399,26 @@ class CanToolsDatabaseTest(unittest.TestCase):
             '     7 |   |   |   |   |   |   |   |   |\n'
             '       +---+---+---+---+---+---+---+---+')
 
+        # Overlapping signals are decoded independently of each
+        # other.
+        decoded = db.messages[0].decode(b'\x35\x3a\xd6\xbc\x3d\x60\x58\x41',
+                                        scaling=False)
+        self.assertEqual(decoded,
+                         {
+                             'DetectionStatus': 5,
+                             'PwrSupply': 3,
+                             'RegenFailedCount': 58,
+                             'Temp': 48342,
+                             'MaxRes': 24637,
+                             'HtrRes': 22624
+                         })
+
+        with self.assertRaises(cantools.database.DecodeError) as cm:
+            db.messages[0].decode(b'\x35\x3a\xd6')
+
+        self.assertEqual(str(cm.exception),
+                         'unpack requires at least 64 bits to unpack (got 24)')
+
     def test_j1939_dbc(self):
         filename = os.path.join('tests', 'files', 'j1939.dbc')
         db = cantools.database.load_file(filename)
@@ -3282,6 +4427,63 @@ class CanToolsDatabaseTest(unittest.TestCase):
         self.assertEqual(db.messages[0].frame_id, 0x15340201)
         self.assertEqual(db.messages[0].protocol, 'j1939')
 
+    def test_j1939_get_message_by_frame_id(self):
+        filename = os.path.join('tests', 'files', 'j1939.dbc')
+        db = cantools.database.load_file(filename)
+
+        # Exact frame id.
+        self.assertEqual(db.get_message_by_frame_id(0x15340201).name,
+                         'Message1')
+
+        # Same PGN, but other priority, destination and source address.
+        self.assertEqual(db.get_message_by_frame_id(0x19340f33).name,
+                         'Message1')
+        self.assertEqual(db.get_message_by_frame_id(0x09f01003).name,
+                         'Message2')
+
+        # Other PGN.
+        with self.assertRaises(KeyError):
+            db.get_message_by_frame_id(0x15f11002)
+
+        with self.assertRaises(KeyError):
+            db.get_message_by_frame_id(0x15f11002)
+
+        self.assertEqual(db.frame_id_cache_info(),
+                         (1, 4, 1024, 4))
+
+        db.refresh()
+        self.assertEqual(db.frame_id_cache_info(), (0, 0, 1024, 0))
+
+        # Messages are found by frame id the same way when decoding.
+        data = b'\x00\x00\x00\x00\x00\x00\x00\x00'
+        self.assertEqual(
+            db.decode_message(0x19340f33, data),
+            db.get_message_by_frame_id(0x19340f33).decode(data))
+        self.assertEqual(db.frame_id_cache_info(), (1, 1, 1024, 1))
+
+        with self.assertRaises(KeyError):
+            db.decode_message(0x15f11002, data)
+
+        # Standard frame ids and messages are not found by PGN.
+        message = cantools.db.Message(0x0c000003,
+                                      'Extended',
+                                      8,
+                                      [],
+                                      is_extended_frame=True,
+                                      protocol='j1939')
+        db = cantools.db.Database([message])
+        self.assertIs(db.try_get_message_by_frame_id(0x0c0000f1), message)
+        self.assertIsNone(db.try_get_message_by_frame_id(0x123))
+        self.assertIsNone(db.try_decode_message(0x123, data)[0])
+
+        message = cantools.db.Message(0x0c000003,
+                                      'Standard',
+                                      8,
+                                      [],
+                                      protocol='j1939')
+        db = cantools.db.Database([message])
+        self.assertIsNone(db.try_get_message_by_frame_id(0x0c0000f1))
+
     def test_j1939_frame_id_pack_unpack(self):
         Data = namedtuple('Data',
                           [